@@ -0,0 +1,284 @@
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from complexity import canonicalize_problem
+from generate_problems import generate
+from pipeline_cache import CACHE_DIR
+from problem_store import atomic_write, iter_problems, rewrite_problems, write_problems
+from validate_problems import validate_corpus
+from validate_taxonomy import check_taxonomy
+import standardize_complexity
+import update_problems_v3
+
+# Scaling benchmarks for the data-pipeline scripts.
+#
+# A synthetic corpus is cloned from the real problems: every field shape is
+# kept, and statements, examples and thinking guides are stretched to vary
+# their length. Each transform runs against a fresh copy of the corpus at
+# every size, in its own spawned process, so peak RSS is that transform's
+# alone. A second, traced run records the tracemalloc peak. Tracing slows
+# Python down several times, so it is skipped above --trace-limit. The
+# 1M-problem size takes minutes per transform and only runs with --large.
+# Results are appended to a JSON history under .cache/ and compared with
+# earlier runs from the same machine.
+
+TEMPLATE_PATHS = ['backend/data/problems.json', 'frontend/src/data/problems.json']
+BENCH_DIR = os.path.join(CACHE_DIR, 'bench')
+HISTORY_PATH = os.path.join(CACHE_DIR, 'benchmark_history.json')
+SIZES = [1000, 10000, 100000]
+LARGE_SIZES = [1000000]
+# Bumped whenever the corpus layout changes, so cached corpora are rebuilt
+CORPUS_FORMAT = 2
+THRESHOLD = 0.25
+WINDOW = 5
+# Differences below these are timer and allocator noise, whatever the ratio
+NOISE_FLOOR = {'wall_s': 0.05, 'peak_rss': 1 << 20, 'tracemalloc_peak': 1 << 20}
+
+
+def _taxonomy(path):
+    rewrite_problems(path, update_problems_v3.assign_taxonomy)
+
+
+def _standardize(path):
+    stage = standardize_complexity.STAGE
+    rewrite_problems(path, stage.transform, ids=stage.ids)
+
+
+def _complexity(path):
+    rewrite_problems(path, canonicalize_problem)
+
+
+# The same work each script does on a cold cache, minus its hard-coded path
+TRANSFORMS = {
+    'generate_problems': generate,
+    'update_problems_v3': _taxonomy,
+    'validate_taxonomy': check_taxonomy,
+    'standardize_complexity': _standardize,
+    'complexity': _complexity,
+    'validate_problems': validate_corpus,
+}
+
+
+def load_templates():
+    for path in TEMPLATE_PATHS:
+        if os.path.isfile(path):
+            return path, list(iter_problems(path))
+    sys.exit(f"No template corpus found (looked for {', '.join(TEMPLATE_PATHS)})")
+
+
+def _stretch(texts, rng):
+    return [texts[i % len(texts)] for i in range(len(texts) * rng.choice((1, 1, 2, 3)))] if texts else texts
+
+
+def synthesize(templates, count, seed=0):
+    """Yield `count` problems shaped like `templates`, with ids 1..count."""
+    rng = random.Random(seed)
+    algorithm_types = sorted({t['algorithmType'] for t in templates if t.get('algorithmType')})
+    for pid in range(1, count + 1):
+        p = json.loads(json.dumps(rng.choice(templates)))
+        p['id'] = pid
+        p['slug'] = f"{p.get('slug', 'problem')}-{pid}"
+        p['title'] = f"{p.get('title', 'Problem')} {pid}"
+        if algorithm_types:
+            p['algorithmType'] = rng.choice(algorithm_types)
+        statement = p.get('problem_statement') or ''
+        p['problem_statement'] = ' '.join([statement] * rng.choice((1, 1, 2, 4, 8)))
+        if isinstance(p.get('examples'), list):
+            p['examples'] = _stretch(p['examples'], rng)
+        if isinstance(p.get('thinking_guide'), dict):
+            p['thinking_guide'] = {k: _stretch(v, rng) if isinstance(v, list) else v
+                                   for k, v in p['thinking_guide'].items()}
+        yield p
+
+
+def corpus_path(templates_path, size, seed):
+    with open(templates_path, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=4).hexdigest()
+    return os.path.join(BENCH_DIR, f'corpus-v{CORPUS_FORMAT}-{size}-{seed}-{digest}.json')
+
+
+def build_corpus(templates_path, templates, size, seed):
+    path = corpus_path(templates_path, size, seed)
+    if not os.path.exists(path):
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        started = time.perf_counter()
+        # write_problems() defaults to the indent=2 layout of problems.json
+        write_problems(path, synthesize(templates, size, seed))
+        print(f"  built {size} problem corpus in {time.perf_counter() - started:.1f} s")
+    return path
+
+
+def _peak_rss():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _measure(name, path, trace):
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    TRANSFORMS[name](path)
+    wall = time.perf_counter() - started
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {'tracemalloc_peak': peak}
+    return {'wall_s': wall, 'peak_rss': _peak_rss()}
+
+
+def run_isolated(name, corpus, trace):
+    """Run one transform on a scratch copy of `corpus` in a fresh process."""
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, 'problems.json')
+        shutil.copyfile(corpus, path)
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            return pool.apply(_measure, (name, path, trace))
+
+
+def benchmark(name, corpus, size, repeat, trace_limit):
+    result = {'transform': name, 'size': size}
+    runs = [run_isolated(name, corpus, False) for _ in range(repeat)]
+    result['wall_s'] = min(r['wall_s'] for r in runs)
+    result['peak_rss'] = None if resource is None else max(r['peak_rss'] for r in runs)
+    result['tracemalloc_peak'] = run_isolated(name, corpus, True)['tracemalloc_peak'] if size <= trace_limit else None
+    return result
+
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'runs': []}
+
+
+def machine_id():
+    return f"{platform.node()}/{platform.machine()}/{platform.python_implementation()} {platform.python_version()}"
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def find_regressions(history, results, machine, threshold=THRESHOLD, window=WINDOW):
+    """Compare `results` with the median of the last `window` runs on `machine`."""
+    previous = [run for run in history['runs'] if run.get('machine') == machine][-window:]
+    regressions = []
+    for result in results:
+        for metric in ('wall_s', 'peak_rss', 'tracemalloc_peak'):
+            value = result.get(metric)
+            past = [r[metric] for run in previous for r in run['results']
+                    if r['transform'] == result['transform'] and r['size'] == result['size'] and r.get(metric)]
+            if value is None or not past:
+                continue
+            baseline = _median(past)
+            if value > baseline * (1 + threshold) and value - baseline > NOISE_FLOOR[metric]:
+                regressions.append((result['transform'], result['size'], metric, baseline, value))
+    return regressions
+
+
+def _format(metric, value):
+    if value is None:
+        return '-'
+    if metric == 'wall_s':
+        return f"{value:.3f} s"
+    return f"{value / (1 << 20):.1f} MiB"
+
+
+def print_scaling(results):
+    """Per-transform table; the exponent is the log-log slope of wall time between sizes."""
+    print(f"{'transform':<24}{'size':>9}{'wall':>12}{'peak RSS':>13}{'tracemalloc':>13}{'exponent':>10}")
+    for name in TRANSFORMS:
+        rows = sorted((r for r in results if r['transform'] == name), key=lambda r: r['size'])
+        for prev, row in zip([None] + rows, rows):
+            exponent = ''
+            if prev and prev['wall_s'] > 0 and row['wall_s'] > 0:
+                k = math.log(row['wall_s'] / prev['wall_s']) / math.log(row['size'] / prev['size'])
+                exponent = f"{k:.2f}" + (' !' if k > 1.3 else '')
+            print(f"{name:<24}{row['size']:>9}{_format('wall_s', row['wall_s']):>12}"
+                  f"{_format('peak_rss', row['peak_rss']):>13}{_format('tracemalloc_peak', row['tracemalloc_peak']):>13}"
+                  f"{exponent:>10}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the data-pipeline scripts on growing synthetic corpora.')
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)), help='comma-separated problem counts')
+    parser.add_argument('--large', action='store_true', help=f"also run {', '.join(map(str, LARGE_SIZES))} problems")
+    parser.add_argument('--transforms', default=','.join(TRANSFORMS), help='comma-separated subset to run')
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per cell; the fastest is kept')
+    parser.add_argument('--trace-limit', type=int, default=100000, help='largest size to run under tracemalloc')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='allowed slowdown before flagging, e.g. 0.25')
+    parser.add_argument('--no-record', action='store_true', help='compare without appending to the history')
+    args = parser.parse_args()
+
+    sizes = sorted({int(s) for s in args.sizes.split(',')} | set(LARGE_SIZES if args.large else ()))
+    names = args.transforms.split(',')
+    unknown = set(names) - set(TRANSFORMS)
+    if unknown:
+        parser.error(f"unknown transforms: {', '.join(sorted(unknown))}")
+
+    templates_path, templates = load_templates()
+    print(f"Templates: {len(templates)} problems from {templates_path}")
+    results = []
+    for size in sizes:
+        corpus = build_corpus(templates_path, templates, size, args.seed)
+        for name in names:
+            result = benchmark(name, corpus, size, args.repeat, args.trace_limit)
+            print(f"  {name} @ {size}: {_format('wall_s', result['wall_s'])}")
+            results.append(result)
+
+    print_scaling(results)
+
+    history = load_history(args.history)
+    machine = machine_id()
+    regressions = find_regressions(history, results, machine, args.threshold)
+    for name, size, metric, baseline, value in regressions:
+        print(f"REGRESSION {name} @ {size}: {metric} {_format(metric, baseline)} -> {_format(metric, value)}")
+
+    if not args.no_record:
+        history['runs'].append({
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'machine': machine,
+            'seed': args.seed,
+            'results': results,
+        })
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with atomic_write(args.history) as f:
+            json.dump(history, f, indent=2)
+            f.write('\n')
+    if regressions:
+        sys.exit(1)
@@ -0,0 +1,682 @@
+import argparse
+import math
+import re
+from collections import namedtuple
+from fractions import Fraction
+from functools import cmp_to_key, lru_cache
+
+# Big-O expression parser.
+#
+# Complexity strings arrive in many spellings ("O(n²)", "O(N^2)",
+# "O(n * target)", "O(1) amortized", "O(log n) to O(n)"). parse() turns
+# them into a canonical AST of plain tuples, cached on the raw string since
+# a handful of forms repeat across the whole corpus. canonical() renders
+# the AST back in one house style, and compare()/growth_key() order
+# expressions by asymptotic growth.
+#
+# AST nodes:
+#   ('const',)            any constant
+#   ('var', name)         single letters upper-cased, words lower-cased
+#   ('pow', base, exp)    exp is a Fraction (sqrt is exp 1/2)
+#   ('exp', base, expr)   base raised to an expression; base is a Fraction
+#                         for a constant, a node for a variable (k^n)
+#   ('log', expr)
+#   ('fact', expr)
+#   ('mul', factors) / ('add', terms) / ('min', args) / ('max', args)
+
+CONST = ('const',)
+
+Complexity = namedtuple('Complexity', 'expr lower qualifier note')
+
+QUALIFIERS = ('amortized', 'average', 'expected', 'worst case', 'best case')
+
+_SUPERSCRIPT = str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹ⁿᴸᵏᵐˣ', '0123456789nLkmx')
+_TO_SUPERSCRIPT = str.maketrans('0123456789', '⁰¹²³⁴⁵⁶⁷⁸⁹')
+_SUPERSCRIPT_RUN = re.compile('[⁰¹²³⁴⁵⁶⁷⁸⁹ⁿᴸᵏᵐˣ]+')
+_TOKEN = re.compile(r'\s*(?:(\d+(?:\.\d+)?)|([A-Za-z_]+)|(\S))')
+_BIG_O = re.compile(r'[OΘΩ]\(')
+_RANGE = re.compile(r'^\s*(?:to|or|-|–)\s*(?=[OΘΩ]\()')
+_FUNCTIONS = {'log', 'lg', 'ln', 'sqrt', 'min', 'max'}
+_HYPHENATED = re.compile(r'[A-Za-z]{2}-[A-Za-z]{2}')
+
+
+class ComplexityError(ValueError):
+    pass
+
+
+# -- smart constructors: every node is built already normalized ------------
+
+def var(name):
+    return ('var', name.upper() if len(name) == 1 else name.lower())
+
+
+def power(base, exp):
+    exp = Fraction(exp)
+    if base == CONST or exp == 0:
+        return CONST
+    if exp == 1:
+        return base
+    if base[0] == 'pow':
+        return power(base[1], base[2] * exp)
+    if base[0] == 'mul':
+        return mul([power(f, exp) for f in base[1]])
+    return ('pow', base, exp)
+
+
+def _split_power(node):
+    return (node[1], node[2]) if node[0] == 'pow' else (node, Fraction(1))
+
+
+def mul(factors):
+    exps = {}
+    order = []
+    for f in factors:
+        for g in (f[1] if f[0] == 'mul' else (f,)):
+            if g == CONST:
+                continue
+            base, exp = _split_power(g)
+            if base not in exps:
+                order.append(base)
+                exps[base] = Fraction(0)
+            exps[base] += exp
+    out = [power(base, exps[base]) for base in order]
+    out = [f for f in out if f != CONST]
+    if not out:
+        return CONST
+    if len(out) == 1:
+        return out[0]
+    return ('mul', tuple(sorted(out, key=_factor_order)))
+
+
+def add(terms):
+    flat = []
+    for t in terms:
+        for u in (t[1] if t[0] == 'add' else (t,)):
+            if u != CONST and u not in flat:
+                flat.append(u)
+    if not flat:
+        return CONST
+    # Drop a term dominated by another over the same variables: n² + n -> n²
+    keep = []
+    for t in flat:
+        tv, tg = _variables(t), growth(t)
+        if not any(u is not t and _variables(u) == tv and growth(u) > tg for u in flat):
+            keep.append(t)
+    if len(keep) == 1:
+        return keep[0]
+    return ('add', tuple(sorted(keep, key=_term_order)))
+
+
+def exponential(base, expr, scale=Fraction(1)):
+    """`base` ^ (`scale` * `expr`), for a Fraction base or a non-constant node base.
+
+    A constant factor in the exponent changes the class (2^(2n) is 4^n), so
+    it is folded into the base; when that base would be irrational, as for
+    2^(n/2), the expression is rejected rather than rounded to another class.
+    """
+    if expr == CONST:
+        return CONST
+    if scale is None:
+        raise ComplexityError("unknown constant factor in exponent")
+    if isinstance(base, tuple):
+        return ('exp', power(base, scale), expr)
+    base = _exact_power(base, scale)
+    if base is None:
+        raise ComplexityError("irrational base after folding the exponent's constant factor")
+    if base <= 1:
+        return CONST
+    return ('exp', base, expr)
+
+
+def _exact_power(x, exp):
+    """`x` ** `exp` for Fractions, or None when it is irrational (or x is unknown)."""
+    if x is None:
+        return None
+    if exp.denominator == 1:
+        return x ** int(exp)
+    if x < 0:
+        return None
+    x = x ** exp.numerator
+    roots = []
+    for v in (x.numerator, x.denominator):
+        r = round(v ** (1 / exp.denominator))
+        if r ** exp.denominator != v:
+            return None
+        roots.append(r)
+    return Fraction(*roots)
+
+
+def _variable_base(node):
+    return isinstance(node[1], tuple)
+
+
+def log(expr):
+    if expr == CONST:
+        return CONST
+    if expr[0] == 'pow':
+        return log(expr[1])
+    if expr[0] == 'exp':
+        # log(k^n) = n log k; a constant base only scales
+        return mul([expr[2], log(expr[1])]) if _variable_base(expr) else expr[2]
+    return ('log', expr)
+
+
+def factorial(expr):
+    return CONST if expr == CONST else ('fact', expr)
+
+
+def bound(kind, args):
+    args = tuple(sorted(set(args), key=_term_order))
+    return args[0] if len(args) == 1 else (kind, args)
+
+
+# -- growth ordering -------------------------------------------------------
+
+# Growth is compared as (factorial, exponential, polynomial, log, log log)
+# exponents, with every variable treated as the same n. That is exact for
+# single-variable classes and a sensible total order for the rest.
+_ZERO = (Fraction(0),) * 5
+
+
+def _scale(g, k):
+    return tuple(c * k for c in g)
+
+
+def _sum(gs):
+    out = _ZERO
+    for g in gs:
+        out = tuple(a + b for a, b in zip(out, g))
+    return out
+
+
+@lru_cache(maxsize=None)
+def growth(node):
+    kind = node[0]
+    if kind == 'const':
+        return _ZERO
+    if kind == 'var':
+        return (0, 0, Fraction(1), 0, 0)
+    if kind == 'pow':
+        return _scale(growth(node[1]), node[2])
+    if kind == 'exp':
+        if _variable_base(node):
+            # k^n = 2^(n log k): with every variable read as n that is n^n,
+            # the class of n!, so it outgrows every constant-base exponential
+            degree = growth(node[1])[2] * growth(node[2])[2]
+            if degree:
+                return (degree, 0, 0, 0, 0)
+            return (0, growth(node[2])[2], 0, 0, 0)
+        return (0, Fraction(math.log2(node[1])) * growth(node[2])[2], 0, 0, 0)
+    if kind == 'log':
+        g = growth(node[1])
+        if g[0] or g[1]:
+            return (0, 0, Fraction(1), 0, 0)
+        if g[2]:
+            return (0, 0, 0, Fraction(1), 0)
+        return (0, 0, 0, 0, Fraction(1)) if g[3] else _ZERO
+    if kind == 'fact':
+        return (growth(node[1])[2], 0, 0, 0, 0)
+    if kind == 'mul':
+        return _sum(growth(f) for f in node[1])
+    if kind in ('add', 'max'):
+        return max(growth(t) for t in node[1])
+    if kind == 'min':
+        return min(growth(t) for t in node[1])
+    raise ComplexityError(f"unknown node {kind!r}")
+
+
+def _variables(node):
+    if node[0] == 'var':
+        return frozenset((node[1],))
+    out = frozenset()
+    for child in node[1:]:
+        if isinstance(child, tuple) and child and isinstance(child[0], str):
+            out |= _variables(child)
+        elif isinstance(child, tuple):
+            for c in child:
+                out |= _variables(c)
+    return out
+
+
+_FACTOR_RANK = {'var': 0, 'pow': 0, 'add': 0, 'min': 0, 'max': 0, 'exp': 1, 'fact': 2, 'log': 3}
+
+
+def _factor_order(node):
+    base = node[1] if node[0] == 'pow' else node
+    return (_FACTOR_RANK.get(node[0], 0), render(base), render(node))
+
+
+def _term_order(node):
+    return (tuple(-c for c in growth(node)), render(node))
+
+
+# -- parsing ---------------------------------------------------------------
+
+def _tokenize(text):
+    text = _SUPERSCRIPT_RUN.sub(lambda m: '^(' + m.group().translate(_SUPERSCRIPT) + ')', text)
+    text = text.replace('√', ' sqrt ').replace('×', '*').replace('·', '*')
+    tokens = []
+    for number, name, symbol in _TOKEN.findall(text):
+        if number:
+            tokens.append(('num', number))
+        elif name:
+            tokens.append(('name', name))
+        elif symbol:
+            tokens.append(('sym', symbol))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self, offset=0):
+        i = self.i + offset
+        return self.tokens[i] if i < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if value is not None and token[1] != value:
+            raise ComplexityError(f"expected {value!r}, got {token[1]!r}")
+        self.i += 1
+        return token
+
+    def done(self):
+        return self.i >= len(self.tokens)
+
+    # Every parse_* method returns (node, scale): scale is the constant factor
+    # the node dropped (2n -> N with scale 2, a plain number -> CONST with its
+    # value), or None when it is not a known rational. Only an exponent reads
+    # it; everywhere else constant factors do not change the class.
+
+    def parse_sum(self):
+        terms = [self.parse_product()]
+        while self.peek()[1] in ('+', '-'):
+            sign = self.take()[1]
+            term = self.parse_product()
+            # Sizes are non-negative, so n - k is at most n: the subtracted
+            # term is dropped, which keeps the result an upper bound
+            if sign == '+':
+                terms.append(term)
+        node = add([t for t, _ in terms])
+        # The factor of each surviving term, e.g. 2 for the N left of 2n + 1
+        scales = []
+        for survivor in (node[1] if node[0] == 'add' else (node,)):
+            matching = [s for t, s in terms if t == survivor]
+            scales.append(None if None in matching else sum(matching))
+        if len(scales) == 1:
+            return node, scales[0]
+        return node, Fraction(1) if all(s == 1 for s in scales) else None
+
+    def _starts_atom(self):
+        kind, value = self.peek()
+        return kind in ('num', 'name') or value == '('
+
+    def parse_product(self):
+        node, scale = self.parse_power()
+        factors = [node]
+
+        def times(s, exp=1):
+            return None if scale is None or s is None else scale * s ** exp
+
+        while True:
+            value = self.peek()[1]
+            if value == '*':
+                self.take()
+                node, s = self.parse_power()
+                factors.append(node)
+                scale = times(s)
+            elif value == '/':
+                # "4^n / n sqrt(n)": implicitly multiplied factors after a
+                # slash all belong to the denominator
+                self.take()
+                node, s = self.parse_power()
+                factors.append(power(node, -1))
+                scale = times(s, -1)
+                while self._starts_atom():
+                    node, s = self.parse_power()
+                    factors.append(power(node, -1))
+                    scale = times(s, -1)
+            elif self._starts_atom():
+                node, s = self.parse_power()
+                factors.append(node)
+                scale = times(s)
+            else:
+                return mul(factors), scale
+
+    def parse_power(self):
+        node, scale = self.parse_atom()
+        while self.peek()[1] == '!':
+            self.take()
+            node, scale = factorial(node), Fraction(1)
+        if self.peek()[1] == '^':
+            self.take()
+            exp, exp_scale = self.parse_atom()
+            if exp == CONST:
+                if exp_scale is None:
+                    raise ComplexityError("unknown exponent")
+                return power(node, exp_scale), _exact_power(scale, exp_scale)
+            if node == CONST:
+                return exponential(scale, exp, exp_scale), Fraction(1)
+            if scale != 1:
+                # (2k)^n is 2^n k^n; no corpus string needs it
+                raise ComplexityError("constant factor in the base of an exponential")
+            # k^n, the usual backtracking bound
+            return exponential(node, exp, exp_scale), Fraction(1)
+        return node, scale
+
+    def parse_atom(self):
+        kind, value = self.take()
+        if kind == 'num':
+            return CONST, Fraction(value)
+        if value == '(':
+            result = self.parse_sum()
+            self.take(')')
+            return result
+        if kind != 'name':
+            raise ComplexityError(f"unexpected {value!r}")
+
+        name = value.lower()
+        if name in ('log', 'lg', 'ln'):
+            degree = 1
+            if self.peek()[1] == '^':
+                self.take()
+                # log^2 n, or log² N as rendered, which tokenizes as log^(2) N
+                exp, degree = self.parse_atom()
+                if exp != CONST or degree is None:
+                    raise ComplexityError("log degree must be a number")
+            if self.peek()[1] == '(':
+                self.take()
+                arg, _ = self.parse_sum()
+                self.take(')')
+            else:
+                arg, _ = self.parse_power()
+            # log(n²) = 2 log n
+            scale = arg[2] ** degree if arg[0] == 'pow' else Fraction(1)
+            return power(log(arg), degree), scale
+        if name == 'sqrt':
+            if self.peek()[1] == '(':
+                self.take()
+                arg, scale = self.parse_sum()
+                self.take(')')
+            else:
+                arg, scale = self.parse_power()
+            return power(arg, Fraction(1, 2)), _exact_power(scale, Fraction(1, 2))
+        if name in ('min', 'max') and self.peek()[1] == '(':
+            self.take()
+            args = [self.parse_sum()[0]]
+            while self.peek()[1] == ',':
+                self.take()
+                args.append(self.parse_sum()[0])
+            self.take(')')
+            return bound(name, args), None
+        return var(value), Fraction(1)
+
+
+def _extract(text, start):
+    """Return (inner, end) for the Big-O call starting at `start`."""
+    i = text.index('(', start) + 1
+    depth = 1
+    for j in range(i, len(text)):
+        if text[j] == '(':
+            depth += 1
+        elif text[j] == ')':
+            depth -= 1
+            if depth == 0:
+                return text[i:j], j + 1
+    raise ComplexityError("unbalanced parentheses")
+
+
+def _parse_expr(inner):
+    # "Set-Bits" is a hyphenated word, not a subtraction
+    if _HYPHENATED.search(inner):
+        raise ComplexityError(f"prose in expression: {inner!r}")
+    tokens = _tokenize(inner)
+    # Two adjacent words ("Product of Lengths") are prose, not a product
+    for (k1, a), (k2, b) in zip(tokens, tokens[1:]):
+        if k1 == k2 == 'name' and len(a) > 1 and len(b) > 1 and a.lower() not in _FUNCTIONS:
+            raise ComplexityError(f"prose in expression: {inner!r}")
+    parser = _Parser(tokens)
+    if parser.done():
+        raise ComplexityError("empty expression")
+    node, _ = parser.parse_sum()
+    if not parser.done():
+        raise ComplexityError(f"unexpected {parser.peek()[1]!r}")
+    return node
+
+
+@lru_cache(maxsize=4096)
+def parse(text):
+    """Parse a complexity string such as "O(n log n) amortized" into a Complexity."""
+    if not isinstance(text, str):
+        raise ComplexityError(f"not a string: {text!r}")
+    raw = text.strip().strip('$').strip()
+    m = _BIG_O.search(raw)
+    if not m:
+        raise ComplexityError(f"no Big-O expression in {text!r}")
+    inner, end = _extract(raw, m.start())
+    expr = _parse_expr(inner)
+
+    lower = None
+    rest = raw[end:]
+    r = _RANGE.match(rest)
+    if r:
+        start = r.end()
+        inner, end = _extract(rest, start)
+        lower, expr = expr, _parse_expr(inner)
+        if growth(lower) > growth(expr):
+            lower, expr = expr, lower
+        rest = rest[end:]
+
+    rest = rest.strip()
+    qualifier = None
+    for q in QUALIFIERS:
+        if rest.lower().startswith(q):
+            qualifier = q
+            rest = rest[len(q):].strip()
+            break
+    note = rest.lstrip('-–:, ').strip() or None
+    return Complexity(expr, lower, qualifier, note)
+
+
+# -- rendering -------------------------------------------------------------
+
+def _fmt_exp(exp):
+    if exp.denominator == 1:
+        return str(exp.numerator).translate(_TO_SUPERSCRIPT)
+    return '^' + format(float(exp), 'g')
+
+
+def _wrap(node):
+    text = render(node)
+    return f'({text})' if node[0] in ('add', 'mul', 'exp', 'pow', 'fact') else text
+
+
+@lru_cache(maxsize=None)
+def render(node):
+    kind = node[0]
+    if kind == 'const':
+        return '1'
+    if kind == 'var':
+        return node[1]
+    if kind == 'pow':
+        base, exp = node[1], node[2]
+        if base[0] == 'log' and exp > 0 and exp.denominator == 1:
+            # log² N rather than (log N)²
+            return 'log' + _fmt_exp(exp) + render(base)[3:]
+        if exp == Fraction(1, 2):
+            return '√' + _wrap(base)
+        if exp < 0:
+            return '1 / ' + render(power(base, -exp))
+        return _wrap(base) + _fmt_exp(exp)
+    if kind == 'exp':
+        base = _wrap(node[1]) if _variable_base(node) else format(float(node[1]), 'g')
+        inner = node[2]
+        return f"{base}^{render(inner) if inner[0] == 'var' else '(' + render(inner) + ')'}"
+    if kind == 'log':
+        inner = node[1]
+        return f"log {inner[1]}" if inner[0] == 'var' else f"log({render(inner)})"
+    if kind == 'fact':
+        return _wrap(node[1]) + '!'
+    if kind == 'mul':
+        num = [f for f in node[1] if not (f[0] == 'pow' and f[2] < 0)]
+        den = [power(f[1], -f[2]) for f in node[1] if f[0] == 'pow' and f[2] < 0]
+        is_log = lambda f: f[0] == 'log' or (f[0] == 'pow' and f[1][0] == 'log')
+        plain = [_wrap(f) if f[0] == 'add' else render(f) for f in num if not is_log(f)]
+        logs = [render(f) for f in num if is_log(f)]
+        text = '*'.join(plain)
+        if logs:
+            text = ' '.join(([text] if text else []) + logs)
+        text = text or '1'
+        if den:
+            d = mul(den)
+            text += ' / ' + (_wrap(d) if d[0] == 'mul' else render(d))
+        return text
+    if kind == 'add':
+        return ' + '.join(render(t) for t in node[1])
+    if kind in ('min', 'max'):
+        return f"{kind}({', '.join(render(a) for a in node[1])})"
+    raise ComplexityError(f"unknown node {kind!r}")
+
+
+def format_complexity(c):
+    text = f"O({render(c.expr)})"
+    if c.lower is not None:
+        text = f"O({render(c.lower)}) to {text}"
+    if c.qualifier:
+        text += f" {c.qualifier}"
+    if c.note:
+        text += f" - {c.note}"
+    return text
+
+
+@lru_cache(maxsize=4096)
+def canonical(text):
+    """The house spelling of a complexity string, e.g. "O(n^2)" -> "O(N²)"."""
+    return format_complexity(parse(text))
+
+
+# -- ordering --------------------------------------------------------------
+
+def growth_key(text):
+    """Sort key: slower-growing complexities first."""
+    c = parse(text)
+    return growth(c.expr), render(c.expr)
+
+
+def compare(a, b):
+    """-1, 0 or 1 as `a` grows slower than, like, or faster than `b`."""
+    ga, gb = growth(parse(a).expr), growth(parse(b).expr)
+    return (ga > gb) - (ga < gb)
+
+
+complexity_sort_key = cmp_to_key(compare)
+
+
+# -- corpus pass -----------------------------------------------------------
+
+TIME_FIELDS = ('time_efficiency', 'time_complexity')
+SPACE_FIELDS = ('space_efficiency', 'space_complexity')
+
+
+def _canon_or_raw(value, failures):
+    try:
+        return canonical(value)
+    except ComplexityError:
+        failures.append(value)
+        return value
+
+
+def canonical_schema(p, failures=None):
+    """Collect every complexity a problem states into {brute, optimal} x {time, space}."""
+    failures = [] if failures is None else failures
+    brute, optimal = {}, {}
+    for field in ('efficiency', 'complexity'):
+        value = p.get(field)
+        if not isinstance(value, dict):
+            continue
+        if 'time' in value:
+            optimal.setdefault('time', value['time'])
+            if 'space' in value:
+                optimal.setdefault('space', value['space'])
+            continue
+        for key, target in (('brute', brute), ('optimal', optimal)):
+            entry = value.get(key)
+            if isinstance(entry, dict):
+                for part in ('time', 'space'):
+                    if isinstance(entry.get(part), str):
+                        target.setdefault(part, entry[part])
+            elif isinstance(entry, str):
+                target.setdefault('time', entry)
+        # The legacy flat shape carries one space bound, for the optimal approach
+        if isinstance(value.get('space'), str):
+            optimal.setdefault('space', value['space'])
+
+    for part, fields in (('time', TIME_FIELDS), ('space', SPACE_FIELDS)):
+        for field in fields:
+            if isinstance(p.get(field), str):
+                optimal.setdefault(part, p[field])
+
+    schema = {}
+    for key, entry in (('brute', brute), ('optimal', optimal)):
+        if entry:
+            schema[key] = {part: _canon_or_raw(entry[part], failures) for part in ('time', 'space') if part in entry}
+    return schema
+
+
+def canonicalize_problem(p, failures=None):
+    failures = [] if failures is None else failures
+    schema = canonical_schema(p, failures)
+    if schema:
+        p['efficiency'] = schema
+        if 'complexity' in p:
+            p['complexity'] = {k: dict(v) for k, v in schema.items()}
+    for field in TIME_FIELDS + SPACE_FIELDS:
+        if isinstance(p.get(field), str):
+            p[field] = _canon_or_raw(p[field], failures)
+    return p
+
+
+def optimal_time(p):
+    return p.get('efficiency', {}).get('optimal', {}).get('time') or p.get('time_efficiency') or p.get('time_complexity')
+
+
+if __name__ == '__main__':
+    from pipeline_cache import Stage, run_stage
+    from problem_store import iter_problems
+
+    parser = argparse.ArgumentParser(description='Canonicalize, sort and filter problems by Big-O complexity.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    rewrite = sub.add_parser('rewrite', help='rewrite every problem to the canonical efficiency schema')
+    rewrite.add_argument('path')
+    rewrite.add_argument('--force', action='store_true', help='ignore the content-hash cache')
+    rank = sub.add_parser('rank', help='list problems ordered by optimal time complexity')
+    rank.add_argument('path')
+    rank.add_argument('--max', help='only problems growing no faster than this, e.g. "O(n log n)"')
+    show = sub.add_parser('show', help='print the canonical form of complexity strings')
+    show.add_argument('expressions', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        for text in args.expressions:
+            print(f"{text!r} -> {canonical(text)!r}")
+    elif args.command == 'rewrite':
+        print(run_stage(args.path, Stage('canonical_complexity', canonicalize_problem), force=args.force))
+        failures = []
+        for p in iter_problems(args.path):
+            canonical_schema(p, failures)
+        for value in sorted(set(failures)):
+            print(f"  unparsed: {value!r}")
+    else:
+        rows = []
+        for p in iter_problems(args.path):
+            try:
+                key = growth_key(optimal_time(p))
+            except ComplexityError:
+                continue
+            if args.max and compare(optimal_time(p), args.max) > 0:
+                continue
+            rows.append((key, p['id'], p.get('title'), canonical(optimal_time(p))))
+        for _, pid, title, time in sorted(rows):
+            print(f"{time:<24} {pid:>6}  {title}")
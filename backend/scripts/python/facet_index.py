@@ -0,0 +1,228 @@
+import argparse
+import json
+from bisect import bisect_left, insort
+
+from problem_store import atomic_write, iter_problems
+
+# Inverted indexes and facet counts over the problems corpus.
+#
+# The sidecar (problems.json.facets.json) maps every value of the FIELDS
+# below to the sorted ids of the problems that carry it, with per-value
+# counts and the level > primary > sub hierarchy counts next to them. Any
+# combination of filters is then an intersection of sorted id arrays, and
+# a facet sidebar needs no scan at all.
+#
+# The facet values of each record are kept too, so when a problem changes
+# only its own entries move: updating k problems touches k postings per
+# field rather than rebuilding the index.
+
+PROBLEMS_PATH = 'backend/data/problems.json'
+VERSION = 1
+FIELDS = ('patternLevel', 'primaryPattern', 'subPattern', 'tags', 'difficulty', 'algorithmType', 'status')
+
+
+def sidecar_path_for(path):
+    return path + '.facets.json'
+
+
+def facets(p):
+    """Facet values of a problem, one sorted tuple per field."""
+    values = []
+    for field in FIELDS:
+        value = p.get(field)
+        if isinstance(value, list):
+            values.append(tuple(sorted({v for v in value if isinstance(v, str) and v})))
+        elif isinstance(value, str) and value:
+            values.append((value,))
+        else:
+            values.append(())
+    return tuple(values)
+
+
+def _hierarchy_path(values):
+    level, primary, sub = (v[0] if v else None for v in values[:3])
+    return (level, primary, sub) if level else None
+
+
+def intersect(a, b):
+    """Sorted intersection of two sorted id lists."""
+    if len(a) > len(b):
+        a, b = b, a
+    out = []
+    i = 0
+    for x in a:
+        i = bisect_left(b, x, i)
+        if i == len(b):
+            break
+        if b[i] == x:
+            out.append(x)
+    return out
+
+
+class FacetIndex:
+    """Sorted id postings per field value, maintained one record at a time."""
+
+    def __init__(self):
+        self.postings = {field: {} for field in FIELDS}
+        self.records = {}
+        self._paths = {}  # (level, primary, sub) -> count
+
+    @classmethod
+    def load(cls, path):
+        """The index saved for the corpus at `path`, or None if there is none."""
+        try:
+            with open(sidecar_path_for(path), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != VERSION or data.get('fields') != list(FIELDS):
+            return None
+        index = cls()
+        for field, values in data['postings'].items():
+            index.postings[field] = values
+        for key, values in data['records'].items():
+            record = tuple(tuple(v) for v in values)
+            index.records[int(key)] = record
+            path_key = _hierarchy_path(record)
+            if path_key:
+                index._paths[path_key] = index._paths.get(path_key, 0) + 1
+        return index
+
+    def counts(self):
+        return {field: {value: len(ids) for value, ids in sorted(postings.items())}
+                for field, postings in self.postings.items()}
+
+    def hierarchy(self):
+        """Problem counts per pattern level, primary pattern and sub-pattern."""
+        tree = {}
+        for (level, primary, sub), count in sorted(self._paths.items(), key=lambda item: tuple(k or '' for k in item[0])):
+            node = tree.setdefault(level, {'count': 0, 'primary': {}})
+            node['count'] += count
+            if primary:
+                child = node['primary'].setdefault(primary, {'count': 0, 'sub': {}})
+                child['count'] += count
+                if sub:
+                    child['sub'][sub] = child['sub'].get(sub, 0) + count
+        return tree
+
+    def save(self, path):
+        with atomic_write(sidecar_path_for(path)) as f:
+            json.dump({
+                'version': VERSION,
+                'fields': list(FIELDS),
+                'count': len(self.records),
+                'postings': {field: dict(sorted(postings.items())) for field, postings in self.postings.items()},
+                'counts': self.counts(),
+                'hierarchy': self.hierarchy(),
+                'records': {str(pid): [list(v) for v in values] for pid, values in sorted(self.records.items())},
+            }, f, separators=(',', ':'), ensure_ascii=False)
+
+    def _move(self, pid, values, delta):
+        for field, field_values in zip(FIELDS, values):
+            postings = self.postings[field]
+            for value in field_values:
+                if delta > 0:
+                    insort(postings.setdefault(value, []), pid)
+                    continue
+                ids = postings[value]
+                del ids[bisect_left(ids, pid)]
+                if not ids:
+                    del postings[value]
+        path_key = _hierarchy_path(values)
+        if path_key:
+            self._paths[path_key] = self._paths.get(path_key, 0) + delta
+            if not self._paths[path_key]:
+                del self._paths[path_key]
+
+    def remove(self, pid):
+        values = self.records.pop(pid, None)
+        if values is not None:
+            self._move(pid, values, -1)
+
+    def add(self, p):
+        """Index (or re-index) one problem; False if its facets did not change."""
+        pid = p.get('id')
+        if not isinstance(pid, int):
+            return False
+        values = facets(p)
+        if self.records.get(pid) == values:
+            return False
+        self.remove(pid)
+        self.records[pid] = values
+        self._move(pid, values, 1)
+        return True
+
+    def update(self, problems):
+        """Re-index `problems`; returns (ids whose facets changed, ids seen)."""
+        seen = set()
+        changed = []
+        for p in problems:
+            # Ids are unique once generate_problems.py has run; before that a
+            # repeated id is indexed from its first record only
+            if p.get('id') in seen:
+                continue
+            seen.add(p.get('id'))
+            if self.add(p):
+                changed.append(p['id'])
+        return changed, seen
+
+    def sync(self, problems):
+        """Bring the index in line with the whole corpus; returns the ids changed or dropped."""
+        changed, seen = self.update(problems)
+        dropped = [pid for pid in self.records if pid not in seen]
+        for pid in dropped:
+            self.remove(pid)
+        return changed + dropped
+
+    def lookup(self, field, value):
+        return self.postings[field].get(value, [])
+
+    def select(self, **filters):
+        """Sorted ids matching every `field=value` filter, e.g. select(difficulty='Easy', tags='Array')."""
+        if not filters:
+            return sorted(self.records)
+        lists = sorted((self.lookup(field, value) for field, value in filters.items()), key=len)
+        result = lists[0]
+        for ids in lists[1:]:
+            result = intersect(result, ids)
+        return result
+
+
+def update_facets(path=PROBLEMS_PATH, ids=None, problems=None):
+    """Refresh the sidecar for the records in `ids`, or for the whole corpus.
+
+    Without a saved index, or with ids=None, every record is read and the
+    index synced, dropping problems that left the corpus. `problems` is the
+    corpus already in memory, to sync from instead of reading `path`.
+    Returns the ids whose facets changed.
+    """
+    index = FacetIndex.load(path)
+    created = index is None
+    if created or ids is None:
+        index = index or FacetIndex()
+        changed = index.sync(iter_problems(path) if problems is None else problems)
+    else:
+        if not ids:
+            return []
+        changed, _ = index.update(iter_problems(path, ids=ids))
+    if changed or created:
+        index.save(path)
+    return changed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Update the inverted facet indexes for problems.json.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('--filter', action='append', default=[], metavar='FIELD=VALUE',
+                        help='print the ids matching all given filters')
+    args = parser.parse_args()
+
+    changed = update_facets(args.path)
+    print(f"Facet index up to date ({len(changed)} problems re-indexed)")
+    if args.filter:
+        filters = dict(f.split('=', 1) for f in args.filter)
+        unknown = set(filters) - set(FIELDS)
+        if unknown:
+            parser.error(f"unknown fields: {', '.join(sorted(unknown))}")
+        ids = FacetIndex.load(args.path).select(**filters)
+        print(f"{len(ids)} matches: {ids}")
@@ -1,5 +1,9 @@
-import json
+import argparse
 import os
+from multiprocessing import Pool
+
+from pipeline_cache import Stage
+from problem_store import chunked, iter_problems, write_problems
 
 patterns = [
     "Array", "Two Pointer", "Sliding Window", "Binary Search", "Recursion",
@@ -78,16 +82,11 @@ metadata_map = {
 }
 
 orig_file = 'backend/data/problems.json'
-with open(orig_file, 'r') as f:
-    existing_problems = json.load(f)
-
-existing_map = {p['id']: p for p in existing_problems}
+CHUNK_SIZE = 256
 
-full_problems = []
-current_ids = set()
 
-# Process existing problems and enrich them
-for pid, p in existing_map.items():
+def enrich_problem(p):
+    pid = p['id']
     if pid in metadata_map:
         m = metadata_map[pid]
         p['primaryPattern'] = m['primaryPattern']
@@ -98,54 +97,45 @@ for pid, p in existing_map.items():
         p['edgeCases'] = ["Empty input", "Single element", "Maximum constraints"]
         if p.get('status') == 'complete':
             p['status'] = 'strong'
-    full_problems.append(p)
-    current_ids.add(pid)
-
-# Add missing metadata problems
-for pid, m in metadata_map.items():
-    if pid not in current_ids:
-        p = {
-            "id": pid,
-            "title": m["title"],
-            "slug": m["slug"],
-            "difficulty": m["difficulty"],
-            "algorithmType": m["algorithmType"],
-            "status": "new",
-            "tags": [m["primaryPattern"]],
-            "primaryPattern": m["primaryPattern"],
-            "shortPatternReason": m["shortPatternReason"],
-            "time_complexity": m["time"],
-            "space_complexity": m["space"],
-            "problem_statement": f"Standard LeetCode problem: {m['title']}.",
-            "constraints": ["N <= 10^5"],
-            "examples": [],
-            "brute_force_explanation": "Iterative approach checking all pairs/subsets.",
-            "optimal_explanation": f"Optimal solution using {m['primaryPattern']}.",
-            "brute_force_steps": [],
-            "optimal_steps": [],
-            "complexity": {"brute": "O(n²)", "optimal": m["time"], "space": m["space"]},
-            "patternSignals": [m["shortPatternReason"]],
-            "edgeCases": ["Small input", "Large values"],
-            "thinking_guide": {
-                "first_principles": [f"Understand the goal of {m['title']}."],
-                "pattern_signals": [m["shortPatternReason"]],
-                "naive_approach": ["Brute force checking all possibilities."],
-                "approach_blueprint": ["1. Apply pattern", "2. Optimize"]
-            }
+    return p
+
+
+def metadata_problem(pid, m):
+    return {
+        "id": pid,
+        "title": m["title"],
+        "slug": m["slug"],
+        "difficulty": m["difficulty"],
+        "algorithmType": m["algorithmType"],
+        "status": "new",
+        "tags": [m["primaryPattern"]],
+        "primaryPattern": m["primaryPattern"],
+        "shortPatternReason": m["shortPatternReason"],
+        "time_complexity": m["time"],
+        "space_complexity": m["space"],
+        "problem_statement": f"Standard LeetCode problem: {m['title']}.",
+        "constraints": ["N <= 10^5"],
+        "examples": [],
+        "brute_force_explanation": "Iterative approach checking all pairs/subsets.",
+        "optimal_explanation": f"Optimal solution using {m['primaryPattern']}.",
+        "brute_force_steps": [],
+        "optimal_steps": [],
+        "complexity": {"brute": "O(n²)", "optimal": m["time"], "space": m["space"]},
+        "patternSignals": [m["shortPatternReason"]],
+        "edgeCases": ["Small input", "Large values"],
+        "thinking_guide": {
+            "first_principles": [f"Understand the goal of {m['title']}."],
+            "pattern_signals": [m["shortPatternReason"]],
+            "naive_approach": ["Brute force checking all possibilities."],
+            "approach_blueprint": ["1. Apply pattern", "2. Optimize"]
         }
-        full_problems.append(p)
-        current_ids.add(pid)
-
-# Finally, fill up to 100 with drilled patterns
-next_id = 1000
-while len(full_problems) < 100:
-    while next_id in current_ids:
-        next_id += 1
-    
-    idx = len(full_problems)
+    }
+
+
+def drill_problem(pid, idx):
     pattern = patterns[idx % len(patterns)]
-    p = {
-        "id": next_id,
+    return {
+        "id": pid,
         "title": f"Pattern Drill {idx + 1}",
         "slug": f"pattern-drill-{idx + 1}",
         "difficulty": "Medium" if idx % 3 == 0 else "Easy",
@@ -165,10 +155,149 @@ while len(full_problems) < 100:
         "optimal_steps": [],
         "complexity": {"brute": "O(n²)", "optimal": "O(n)", "space": "O(1)"}
     }
-    full_problems.append(p)
-    current_ids.add(next_id)
 
-with open(orig_file, 'w') as f:
-    json.dump(full_problems, f, indent=2)
 
-print(f"Enriched and expanded to {len(full_problems)} problems.")
+# The per-record half of generation, for incremental runs (see watch.py).
+# Filling in missing problems still needs a full generate() pass.
+ENRICH_STAGE = Stage('enrich', enrich_problem, (metadata_map,))
+
+
+def enrich_chunk(chunk):
+    return [enrich_problem(p) for p in chunk]
+
+
+def build_chunk(specs):
+    # (pid, None) is a missing metadata problem, (pid, idx) a pattern drill
+    return [metadata_problem(pid, metadata_map[pid]) if idx is None else drill_problem(pid, idx)
+            for pid, idx in specs]
+
+
+def missing_specs(current_ids, count):
+    # Ids are assigned here, serially, so collisions resolve exactly as in a
+    # single-process run; only record construction is farmed out.
+
+    # Add missing metadata problems
+    for pid in metadata_map:
+        if pid not in current_ids:
+            yield pid, None
+            current_ids.add(pid)
+            count += 1
+
+    # Finally, fill up to 100 with drilled patterns
+    next_id = 1000
+    while count < 100:
+        while next_id in current_ids:
+            next_id += 1
+        yield next_id, count
+        current_ids.add(next_id)
+        count += 1
+
+
+def last_copies(problems):
+    """{id: last record} for every id that occurs more than once in `problems`."""
+    last = {}
+    repeated = set()
+    for p in problems:
+        if p['id'] in last:
+            repeated.add(p['id'])
+        last[p['id']] = p
+    return {pid: last[pid] for pid in repeated}
+
+
+def expand(problems, mapper=map, chunk_size=CHUNK_SIZE, index=None, current_ids=None, repeated=None):
+    """Enrich `problems` and append the missing ones, yielding records in output order.
+
+    `current_ids` collects every id handed out. With a near-duplicate
+    `index`, new problems too close to an indexed one are left out.
+    `repeated` is last_copies(problems); it is worked out here when
+    `problems` is a list, a one-shot iterable has to pass it in.
+    """
+    current_ids = set() if current_ids is None else current_ids
+    if repeated is None:
+        if iter(problems) is problems:
+            raise TypeError('expand() needs repeated=last_copies(...) for a one-shot iterable')
+        repeated = last_copies(problems)
+
+    def unique_problems():
+        # As with the original {p['id']: p} dict, a repeated id keeps the
+        # position of its first record and the content of its last one.
+        for p in problems:
+            if p['id'] not in current_ids:
+                current_ids.add(p['id'])
+                yield repeated.get(p['id'], p)
+
+    def novel(p):
+        if index is None:
+            return True
+        matches = index.query(p)
+        if matches:
+            pid, similarity = matches[0]
+            print(f"Skipped {p['title']} ({p['id']}): {similarity:.2f} similar to problem {pid}")
+            index.skipped.add(p['id'])
+            return False
+        index.add(p)
+        return True
+
+    for chunk in mapper(enrich_chunk, chunked(unique_problems(), chunk_size)):
+        if index is not None:
+            for p in chunk:
+                index.add(p)
+        yield from chunk
+    # The enrichment stream is exhausted here, so current_ids is complete
+    if index is not None:
+        # Problems skipped as near-duplicates before keep their id and their
+        # place in the count, so a rerun does not mint and reject them again.
+        # A drill's text depends only on its place, so a freed slot would be
+        # refilled with the same text under a new id; the corpus instead ends
+        # up that many problems short of the target (see generate()).
+        index.skipped -= current_ids
+        current_ids |= index.skipped
+    for chunk in mapper(build_chunk, chunked(missing_specs(current_ids, len(current_ids)), chunk_size)):
+        yield from filter(novel, chunk)
+
+
+def generate(path, workers=1, chunk_size=CHUNK_SIZE, near_duplicates=None):
+    """Enrich and expand the corpus at `path`; returns the problem count.
+
+    With workers > 1 chunks are processed in a process pool. Pool.imap hands
+    results back in submission order, so the file is byte-identical to a
+    serial run. With a `near_duplicates` similarity (True for the default),
+    new problems whose text is that close to one already in the corpus are
+    left out, and the corpus stays one problem short of the drill target for
+    each of them, on this run and every later one.
+    """
+    current_ids = set()
+    index = None
+    if near_duplicates:
+        # Imported here so plain runs do not need NumPy
+        from near_duplicates import THRESHOLD, NearDuplicateIndex
+        index = NearDuplicateIndex.load(path, THRESHOLD if near_duplicates is True else near_duplicates)
+
+    # One extra streaming pass; only the records of repeated ids are kept
+    repeated = last_copies(iter_problems(path))
+    if workers <= 1:
+        total = write_problems(path, expand(iter_problems(path), map, chunk_size, index, current_ids, repeated))
+    else:
+        with Pool(workers) as pool:
+            total = write_problems(path, expand(iter_problems(path), pool.imap, chunk_size, index, current_ids, repeated))
+    if index is not None:
+        # Forget problems that are no longer in the corpus
+        index.retain(current_ids)
+        index.save(path)
+        if index.skipped:
+            print(f"{len(index.skipped)} near-duplicate problems hold their slots empty; "
+                  f"the corpus has {total} problems instead of {total + len(index.skipped)}")
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Enrich problems.json and fill it up with pattern drills.')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (0 = one per core)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--near-duplicates', type=float, nargs='?', const=True, metavar='SIMILARITY',
+                        help='skip new problems at least this similar to an existing one (default 0.8)')
+    args = parser.parse_args()
+
+    total = generate(orig_file, args.workers or os.cpu_count(), args.chunk_size, args.near_duplicates)
+
+    print(f"Enriched and expanded to {total} problems.")
@@ -0,0 +1,304 @@
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from problem_store import atomic_write, chunked, iter_problems
+from taxonomy import load_taxonomy
+
+# Batch recomputation of mastery scores for every user.
+#
+# UserProgress and SolvedProblem are read in one query each into NumPy
+# arrays, and every score is a vectorized reduction over them:
+#
+# - confidence per (user, module): the weighted mix of the component scores
+#   that updatePatternMastery uses in frontend/src/store/useStore.ts, less
+#   the skill decay of checkSkillDecay (one point per day past GRACE_DAYS,
+#   at most MAX_DECAY). Solving a problem of the module counts as practice,
+#   so decay runs from the later of lastPracticed and the last such solve.
+# - per sub-pattern: the stored subPatternConfidence scores with the same
+#   decay as their row, plus how many of the sub-pattern's problems the user
+#   solved.
+# - per primary pattern and pattern level: the mean module confidence, with
+#   modules placed in the taxonomy update_problems_v3.py assigns.
+#
+# Only confidence has a column, and it is always derived from the component
+# scores, so writing it back is idempotent. Changed rows are written in
+# batches of BATCH_SIZE, each in its own transaction. The sub-pattern and
+# taxonomy rollups go to an optional JSON report.
+
+DB_PATH = 'database/prisma/dev.db'
+PROBLEMS_PATH = 'backend/data/problems.json'
+BATCH_SIZE = 5000
+COMPONENTS = ('drillScore', 'visualizerScore', 'recognitionScore', 'edgeCaseScore', 'templateScore')
+WEIGHTS = np.array([0.4, 0.2, 0.2, 0.1, 0.1])
+GRACE_DAYS = 14
+MAX_DECAY = 10
+DAY_MS = 86400000
+
+
+def _epoch_ms(column):
+    # Prisma stores DateTime as epoch milliseconds; rows written with the SQL
+    # default hold CURRENT_TIMESTAMP text instead
+    return (f'CASE typeof("{column}") WHEN \'text\' '
+            f'THEN CAST((julianday("{column}") - 2440587.5) * 86400000 AS INTEGER) ELSE "{column}" END')
+
+
+def load_progress(conn):
+    """Every UserProgress row as column arrays, or None if there are none."""
+    components = ', '.join(f'"{c}"' for c in COMPONENTS)
+    rows = conn.execute(f'SELECT "id", "userId", "moduleId", {components}, "confidence", '
+                        f'{_epoch_ms("lastPracticed")}, "subPatternConfidence" FROM "UserProgress"').fetchall()
+    if not rows:
+        return None
+    columns = list(zip(*rows))
+    k = len(COMPONENTS)
+    return {
+        'id': list(columns[0]),
+        'userId': np.array(columns[1], dtype=object),
+        'moduleId': np.array(columns[2], dtype=object),
+        'scores': np.array(columns[3:3 + k], dtype=np.float64).T,
+        'confidence': np.array(columns[3 + k], dtype=np.float64),
+        'lastPracticed': np.array(columns[4 + k], dtype=np.int64),
+        'subPatternConfidence': columns[5 + k],
+    }
+
+
+def load_solved(conn):
+    rows = conn.execute(f'SELECT "userId", "problemSlug", {_epoch_ms("solvedAt")} FROM "SolvedProblem"').fetchall()
+    users, slugs, solved_at = zip(*rows) if rows else ((), (), ())
+    return {
+        'userId': np.array(users, dtype=object),
+        'problemSlug': np.array(slugs, dtype=object),
+        'solvedAt': np.array(solved_at, dtype=np.int64),
+    }
+
+
+class ProblemTaxonomy:
+    """Slug -> (algorithmType, level, primary, sub), and where each module sits in the taxonomy."""
+
+    def __init__(self, problems, taxonomy):
+        self.by_slug = {}
+        placements = {}
+        for p in problems:
+            slug = p.get('slug')
+            if not slug or slug in self.by_slug:
+                continue
+            entry = (p.get('algorithmType'), p.get('patternLevel'), p.get('primaryPattern'), p.get('subPattern'))
+            self.by_slug[slug] = entry
+            if entry[0] and entry[1] and entry[2]:
+                placements.setdefault(entry[0], Counter())[entry[1:3]] += 1
+        # A module id is either a primary pattern key or an algorithmType;
+        # the latter sits where most of its problems were placed
+        self.module_place = {t: counts.most_common(1)[0][0] for t, counts in placements.items()}
+        for primary, level in taxonomy.level_of.items():
+            self.module_place[primary] = (level, primary)
+        self.sub_totals = Counter(entry[3] for entry in self.by_slug.values() if entry[3])
+
+    def modules_of(self, slug):
+        """Module ids a solve of `slug` counts as practice for."""
+        entry = self.by_slug.get(slug)
+        if entry is None:
+            return ()
+        return tuple({m for m in (entry[0], entry[2]) if m})
+
+
+def weighted_confidence(scores):
+    # Math.round in the frontend rounds halves up
+    return np.minimum(100.0, np.floor(scores @ WEIGHTS + 0.5))
+
+
+def decay_points(last_practiced_ms, now_ms):
+    days = (now_ms - last_practiced_ms) / DAY_MS
+    return np.clip(np.floor(days - GRACE_DAYS), 0, MAX_DECAY)
+
+
+def _vocabulary(*columns):
+    """Sorted unique strings over `columns`; codes are positions in it."""
+    return np.unique(np.concatenate([np.asarray(c, dtype=object).astype(str) for c in columns] + [np.array([], str)]))
+
+
+def _codes(vocabulary, values):
+    return np.searchsorted(vocabulary, np.asarray(values, dtype=object).astype(str))
+
+
+def _group_mean(keys, values):
+    """Mean of `values` per distinct key; returns (keys, means)."""
+    uniques, codes = np.unique(keys, return_inverse=True)
+    totals = np.bincount(codes, weights=values, minlength=len(uniques))
+    return uniques, totals / np.bincount(codes, minlength=len(uniques))
+
+
+def _nest(result, name, keys, values, users, nodes):
+    # keys are user_code * len(nodes) + node_code
+    for key, value in zip(keys.tolist(), values.tolist()):
+        user, node = divmod(key, len(nodes))
+        result.setdefault(str(users[user]), {}).setdefault(name, {})[str(nodes[node])] = value
+
+
+def last_solves(progress, solved, places, users):
+    """Latest solvedAt per progress row among the user's solves in that module, 0 if none."""
+    latest_at = np.zeros(len(progress['id']), dtype=np.int64)
+    if not len(solved['userId']):
+        return latest_at
+    slugs, slug_codes = np.unique(solved['problemSlug'].astype(str), return_inverse=True)
+    slug_modules = [places.modules_of(slug) for slug in slugs.tolist()]
+    modules = _vocabulary(progress['moduleId'], [m for ms in slug_modules for m in ms])
+    user_codes = _codes(users, solved['userId'])
+
+    # A solve counts for up to two modules (its algorithmType and primary pattern)
+    keys, times = [], []
+    for k in range(2):
+        module_of_slug = np.array([_codes(modules, [ms[k]])[0] if len(ms) > k else -1 for ms in slug_modules])
+        module_codes = module_of_slug[slug_codes]
+        hit = module_codes >= 0
+        keys.append(user_codes[hit] * len(modules) + module_codes[hit])
+        times.append(solved['solvedAt'][hit])
+    keys, times = np.concatenate(keys), np.concatenate(times)
+    if not len(keys):
+        return latest_at
+    uniques, codes = np.unique(keys, return_inverse=True)
+    latest = np.zeros(len(uniques), dtype=np.int64)
+    np.maximum.at(latest, codes, times)
+
+    row_keys = _codes(users, progress['userId']) * len(modules) + _codes(modules, progress['moduleId'])
+    at = np.minimum(np.searchsorted(uniques, row_keys), len(uniques) - 1)
+    return np.where(uniques[at] == row_keys, latest[at], 0)
+
+
+def sub_pattern_scores(progress, decay, users, result):
+    """Mean decayed subPatternConfidence per (user, sub-pattern), into result[user]['subPatterns']."""
+    rows, subs, scores = [], [], []
+    # The JSON column has to be decoded row by row; everything after is vectorized
+    for row, raw in enumerate(progress['subPatternConfidence']):
+        if not raw:
+            continue
+        try:
+            entries = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(entries, dict):
+            continue
+        for sub, score in entries.items():
+            if isinstance(score, (int, float)):
+                rows.append(row)
+                subs.append(sub)
+                scores.append(score)
+    if not rows:
+        return
+    rows = np.array(rows)
+    values = np.maximum(0.0, np.array(scores, dtype=np.float64) - decay[rows])
+    nodes = _vocabulary(subs)
+    keys = _codes(users, progress['userId'][rows]) * len(nodes) + _codes(nodes, subs)
+    keys, means = _group_mean(keys, values)
+    _nest(result, 'subPatterns', keys, np.round(means, 1), users, nodes)
+
+
+def solved_per_sub_pattern(solved, places, users, result):
+    """Distinct solved problems per (user, sub-pattern), into result[user]['solvedPerSubPattern']."""
+    if not len(solved['userId']):
+        return
+    slugs, slug_codes = np.unique(solved['problemSlug'].astype(str), return_inverse=True)
+    slug_subs = [(places.by_slug.get(slug) or (None,) * 4)[3] or '' for slug in slugs.tolist()]
+    nodes = _vocabulary([s for s in slug_subs if s])
+    if not len(nodes):
+        return
+    sub_of_slug = np.array([_codes(nodes, [s])[0] if s else -1 for s in slug_subs])
+    # Solving the same problem twice counts once
+    pairs = np.unique(_codes(users, solved['userId']) * len(slugs) + slug_codes)
+    user_codes, slug_codes = np.divmod(pairs, len(slugs))
+    sub_codes = sub_of_slug[slug_codes]
+    hit = sub_codes >= 0
+    keys, counts = np.unique(user_codes[hit] * len(nodes) + sub_codes[hit], return_counts=True)
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        user, node = divmod(key, len(nodes))
+        sub = str(nodes[node])
+        result.setdefault(str(users[user]), {}).setdefault('solvedPerSubPattern', {})[sub] = {
+            'solved': count, 'total': places.sub_totals.get(sub, 0)}
+
+
+def taxonomy_rollups(progress, confidence, places, users, result):
+    """Mean module confidence per (user, primary) and (user, level), into result[user]."""
+    modules, module_codes = np.unique(progress['moduleId'].astype(str), return_inverse=True)
+    placed = [places.module_place.get(m) for m in modules.tolist()]
+    user_codes = _codes(users, progress['userId'])
+    for depth, name in ((1, 'primary'), (0, 'levels')):
+        nodes = _vocabulary([p[depth] for p in placed if p])
+        node_of_module = np.array([_codes(nodes, [p[depth]])[0] if p else -1 for p in placed])
+        node_codes = node_of_module[module_codes]
+        hit = node_codes >= 0
+        if not hit.any():
+            continue
+        keys, means = _group_mean(user_codes[hit] * len(nodes) + node_codes[hit], confidence[hit])
+        _nest(result, name, keys, np.round(means, 1), users, nodes)
+
+
+def recompute(conn, places, now_ms=None):
+    """Compute every score; returns (progress, new confidence, report)."""
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    progress = load_progress(conn)
+    if progress is None:
+        return None, None, {}
+    solved = load_solved(conn)
+    users = _vocabulary(progress['userId'], solved['userId'])
+
+    practiced = np.maximum(progress['lastPracticed'], last_solves(progress, solved, places, users))
+    decay = decay_points(practiced, now_ms)
+    confidence = np.maximum(0.0, weighted_confidence(progress['scores']) - decay)
+
+    report = {}
+    for user, module, value in zip(progress['userId'].tolist(), progress['moduleId'].tolist(), confidence.tolist()):
+        report.setdefault(user, {}).setdefault('modules', {})[module] = value
+    sub_pattern_scores(progress, decay, users, report)
+    solved_per_sub_pattern(solved, places, users, report)
+    taxonomy_rollups(progress, confidence, places, users, report)
+    return progress, confidence, report
+
+
+def write_confidence(conn, progress, confidence, batch_size=BATCH_SIZE):
+    """Write the rows whose confidence moved, one transaction per batch; returns the count."""
+    changed = np.flatnonzero(np.abs(confidence - progress['confidence']) > 1e-9)
+    updates = ((float(confidence[i]), progress['id'][i]) for i in changed.tolist())
+    for batch in chunked(updates, batch_size):
+        with conn:
+            conn.executemany('UPDATE "UserProgress" SET "confidence" = ? WHERE "id" = ?', batch)
+    return len(changed)
+
+
+def run(db_path=DB_PATH, problems_path=PROBLEMS_PATH, now_ms=None, dry_run=False, batch_size=BATCH_SIZE):
+    places = ProblemTaxonomy(iter_problems(problems_path), load_taxonomy())
+    conn = sqlite3.connect(db_path)
+    try:
+        progress, confidence, report = recompute(conn, places, now_ms)
+        if progress is None:
+            return 0, 0, report
+        written = 0 if dry_run else write_confidence(conn, progress, confidence, batch_size)
+        return len(progress['id']), written, report
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Recompute mastery scores for every user in one batch.')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--problems', default=PROBLEMS_PATH, help='corpus with the taxonomy from update_problems_v3.py')
+    parser.add_argument('--report', help='write per-user module, sub-pattern and taxonomy scores to this JSON file')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help='compute without writing confidence back')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        rows, written, report = run(args.db, args.problems, dry_run=args.dry_run, batch_size=args.batch_size)
+    except sqlite3.OperationalError as e:
+        sys.exit(f"Could not read {args.db}: {e}")
+    if args.report:
+        with atomic_write(args.report) as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    verb = 'would change' if args.dry_run else 'updated'
+    print(f"{rows} progress rows for {len(report)} users, {verb} {written} confidence values "
+          f"({time.perf_counter() - started:.2f} s)")
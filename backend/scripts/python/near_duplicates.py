@@ -0,0 +1,264 @@
+import argparse
+import hashlib
+import os
+import re
+import zlib
+
+import numpy as np
+
+from problem_store import atomic_write, iter_problems
+
+# Near-duplicate detection over problem text.
+#
+# Each problem's statement, optimal explanation and examples are reduced to
+# word shingles and summarized by a MinHash signature of NUM_PERM 32-bit
+# values; the fraction of equal positions between two signatures estimates
+# the Jaccard similarity of their shingle sets. Signatures are split into
+# BANDS bands of ROWS values and every band is hashed into a bucket, so a
+# query only compares against problems sharing at least one bucket instead
+# of the whole corpus.
+#
+# The signatures live in a sidecar next to the corpus (problems.json.lsh.npz)
+# together with a digest of the text they came from. Syncing re-hashes only
+# problems whose text changed; everything else is reused. The sidecar also
+# records the ids generate_problems.py left out as near-duplicates, so a
+# rerun does not mint and re-check them again.
+
+PROBLEMS_PATH = 'backend/data/problems.json'
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+SEED = 1
+THRESHOLD = 0.8
+
+_PRIME = (1 << 61) - 1
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_WORD = re.compile(r'\w+')
+_PARAMS = np.array([NUM_PERM, BANDS, SHINGLE, SEED], dtype=np.int64)
+
+_rng = np.random.default_rng(SEED)
+# a * h + b stays below 2^64 for 32-bit a, b and h, so uint64 math is exact
+_A = _rng.integers(1, 1 << 32, NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64)[:, None]
+
+
+def sidecar_path_for(path):
+    return path + '.lsh.npz'
+
+
+def _example_text(example):
+    if isinstance(example, dict):
+        return ' '.join(str(v) for v in example.values() if v is not None)
+    return str(example)
+
+
+def document(p):
+    """The text a problem is compared on."""
+    parts = [p.get('problem_statement') or '', p.get('optimal_explanation') or '']
+    examples = p.get('examples')
+    if isinstance(examples, list):
+        parts.extend(_example_text(e) for e in examples)
+    return ' '.join(parts)
+
+
+def text_digest(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def shingles(text, k=SHINGLE):
+    words = _WORD.findall(text.lower())
+    if len(words) <= k:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def signature(text):
+    """MinHash signature of `text`, or None when it has no words."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    h = np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+    return (((_A * h[None, :] + _B) % _PRIME) & 0xFFFFFFFF).min(axis=1).astype(np.uint32)
+
+
+def band_keys(signatures):
+    """One 64-bit bucket key per band, for each row of `signatures`."""
+    bands = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    keys = np.full(bands.shape[:2], _FNV_OFFSET, dtype=np.uint64)
+    for r in range(ROWS):
+        keys = (keys ^ bands[:, :, r]) * _FNV_PRIME
+    # Equal values in different bands must not share a bucket
+    return keys ^ (np.arange(BANDS, dtype=np.uint64) * _GOLDEN)
+
+
+class NearDuplicateIndex:
+    """MinHash signatures of problem text with LSH buckets for sub-linear lookups."""
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self._sigs = np.zeros((0, NUM_PERM), dtype=np.uint32)
+        self._row = {}      # id -> row in _sigs
+        self._ids = []      # row -> id, None for a free row
+        self._digest = {}   # id -> digest of the text its signature came from
+        self._buckets = {}  # band key -> rows
+        self._free = []
+        self.skipped = set()  # ids left out of the corpus as near-duplicates
+
+    def __len__(self):
+        return len(self._row)
+
+    def __contains__(self, pid):
+        return pid in self._row
+
+    @classmethod
+    def load(cls, path, threshold=THRESHOLD):
+        """The index saved for the corpus at `path`, or an empty one."""
+        index = cls(threshold)
+        try:
+            with np.load(sidecar_path_for(path)) as data:
+                if not np.array_equal(data['params'], _PARAMS):
+                    return index
+                ids, digests, sigs = data['ids'], data['digests'], data['signatures']
+                skipped = data['skipped'].tolist() if 'skipped' in data.files else []
+        except (OSError, KeyError, ValueError):
+            return index
+        index._sigs = sigs.copy()
+        index._ids = ids.tolist()
+        index._row = {pid: row for row, pid in enumerate(index._ids)}
+        index._digest = dict(zip(index._ids, digests.tolist()))
+        index.skipped = set(skipped)
+        for row, keys in enumerate(band_keys(index._sigs).tolist()):
+            for key in keys:
+                index._buckets.setdefault(key, []).append(row)
+        return index
+
+    def save(self, path):
+        rows = sorted(self._row.values())
+        ids = [self._ids[row] for row in rows]
+        with atomic_write(sidecar_path_for(path), binary=True) as f:
+            np.savez(f, params=_PARAMS, ids=np.array(ids, dtype=np.int64),
+                     digests=np.array([self._digest[pid] for pid in ids], dtype=np.uint64),
+                     signatures=self._sigs[rows], skipped=np.array(sorted(self.skipped), dtype=np.int64))
+
+    def _unbucket(self, row):
+        for key in band_keys(self._sigs[row:row + 1])[0].tolist():
+            bucket = self._buckets[key]
+            bucket.remove(row)
+            if not bucket:
+                del self._buckets[key]
+
+    def remove(self, pid):
+        row = self._row.pop(pid, None)
+        if row is None:
+            return
+        self._unbucket(row)
+        self._ids[row] = None
+        del self._digest[pid]
+        self._free.append(row)
+
+    def add(self, p):
+        """Index (or re-index) one problem; False if its text was already indexed as is."""
+        pid = p.get('id')
+        if pid is None:
+            return False
+        text = document(p)
+        digest = text_digest(text)
+        if self._digest.get(pid) == digest and pid in self._row:
+            return False
+        had = pid in self._row
+        self.remove(pid)
+        sig = signature(text)
+        if sig is None:
+            return had
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._ids)
+            if row == len(self._sigs):
+                grown = np.zeros((max(64, 2 * row), NUM_PERM), dtype=np.uint32)
+                grown[:row] = self._sigs
+                self._sigs = grown
+            self._ids.append(None)
+        self._sigs[row] = sig
+        self._ids[row] = pid
+        self._row[pid] = row
+        self._digest[pid] = digest
+        for key in band_keys(sig[None, :])[0].tolist():
+            self._buckets.setdefault(key, []).append(row)
+        return True
+
+    def _matches(self, sig, exclude=None):
+        keys = band_keys(sig[None, :])[0].tolist()
+        rows = {row for key in keys for row in self._buckets.get(key, ())}
+        rows.discard(self._row.get(exclude))
+        if not rows:
+            return []
+        rows = np.fromiter(rows, dtype=np.int64, count=len(rows))
+        similarity = (self._sigs[rows] == sig).mean(axis=1)
+        hits = np.flatnonzero(similarity >= self.threshold)
+        return sorted(((self._ids[rows[i]], float(similarity[i])) for i in hits), key=lambda m: -m[1])
+
+    def query(self, p):
+        """(id, estimated similarity) of indexed problems near `p`, most similar first."""
+        sig = signature(document(p))
+        return [] if sig is None else self._matches(sig, exclude=p.get('id'))
+
+    def similar(self, pid):
+        """Like query(), for a problem already in the index."""
+        row = self._row.get(pid)
+        return [] if row is None else self._matches(self._sigs[row], exclude=pid)
+
+    def retain(self, ids):
+        """Drop every problem whose id is not in `ids`; returns the dropped ids."""
+        dropped = [pid for pid in self._row if pid not in ids]
+        for pid in dropped:
+            self.remove(pid)
+        return dropped
+
+    def sync(self, problems):
+        """Bring the index in line with `problems`; returns the ids re-hashed or dropped."""
+        seen = set()
+        changed = []
+        for p in problems:
+            # Ids are unique once generate_problems.py has run; before that a
+            # repeated id is indexed from its first record only
+            if p.get('id') in seen:
+                continue
+            seen.add(p.get('id'))
+            if self.add(p):
+                changed.append(p.get('id'))
+        return changed + self.retain(seen)
+
+    def pairs(self):
+        """Every near-duplicate pair (id, id, similarity) once, lower row first."""
+        for pid, row in sorted(self._row.items(), key=lambda item: item[1]):
+            for other, similarity in self.similar(pid):
+                if self._row[other] > row:
+                    yield pid, other, similarity
+
+
+def sync_index(path=PROBLEMS_PATH, threshold=THRESHOLD):
+    """Load, sync and save the index for `path`; returns (index, changed ids)."""
+    index = NearDuplicateIndex.load(path, threshold)
+    changed = index.sync(iter_problems(path))
+    if changed or not os.path.exists(sidecar_path_for(path)):
+        index.save(path)
+    return index, changed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Update the near-duplicate index and list similar problems.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='estimated Jaccard similarity to report')
+    args = parser.parse_args()
+
+    index, changed = sync_index(args.path, args.threshold)
+    print(f"Indexed {len(index)} problems ({len(changed)} re-hashed or dropped)")
+    count = 0
+    for a, b, similarity in index.pairs():
+        count += 1
+        print(f"  {a} ~ {b}: {similarity:.2f}")
+    print(f"{count} near-duplicate pairs at similarity >= {args.threshold}")
@@ -0,0 +1,181 @@
+import argparse
+import cProfile
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from facet_index import update_facets
+from generate_problems import expand
+from pipeline_cache import record_hash
+from problem_model import as_dict, load_problems, save_problems
+from taxonomy import load_taxonomy
+from validate_problems import ErrorBuffer
+import standardize_complexity
+import update_problems_v2
+import update_problems_v3
+
+# The data migrations as one in-memory run.
+#
+# Running generate_problems, update_problems_v2, update_problems_v3,
+# standardize_complexity and validate_taxonomy one after the other parses
+# the corpus five times and rewrites it four times. Here it is loaded once,
+# every stage's transform is applied to the records in memory, the result
+# is validated against the taxonomy, and the file is written once, only
+# if validation passed. Records are held as problem_model.Problem, so the
+# text fields no stage touches stay on disk until the write.
+#
+# --profile reports per stage the wall time, the records going in and out,
+# how many records the stage actually changed (by content hash) and the
+# tracemalloc peak above what was allocated before it started. Tracing
+# slows Python down, so the times are for comparing stages with each other.
+# --cprofile DIR also dumps one cProfile file per stage.
+
+PROBLEMS_PATH = 'backend/data/problems.json'
+
+
+def per_record(stage):
+    """A pipeline_cache.Stage applied to a list of records, honouring its ids."""
+    scope = set(stage.ids) if stage.ids is not None else None
+
+    def run(records):
+        return [stage.transform(p) if scope is None or p.get('id') in scope else p for p in records]
+    return run
+
+
+def _generate(records):
+    return list(expand(records))
+
+
+STAGES = [
+    ('generate_problems', _generate),
+    ('update_problems_v2', per_record(update_problems_v2.STAGE)),
+    ('update_problems_v3', per_record(update_problems_v3.STAGE)),
+    ('standardize_complexity', per_record(standardize_complexity.STAGE)),
+]
+
+
+class StageProfile:
+    __slots__ = ('name', 'wall_s', 'records_in', 'records_out', 'touched', 'alloc_peak')
+
+    def __init__(self, name, wall_s, records_in, records_out, touched=None, alloc_peak=None):
+        self.name = name
+        self.wall_s = wall_s
+        self.records_in = records_in
+        self.records_out = records_out
+        self.touched = touched
+        self.alloc_peak = alloc_peak
+
+
+def _touched(before, after):
+    # Records whose content is new after the stage, inserted ones included
+    return sum((Counter(record_hash(as_dict(p)) for p in after) - before).values())
+
+
+def run_stage(name, fn, records, profile=False, cprofile_dir=None):
+    """Apply one stage to `records`; returns (records, StageProfile)."""
+    before = Counter(record_hash(as_dict(p)) for p in records) if profile else None
+    records_in = len(records)
+    profiler = cProfile.Profile() if cprofile_dir else None
+    if profile:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    if profiler:
+        profiler.enable()
+    started = time.perf_counter()
+    records = fn(records)
+    wall = time.perf_counter() - started
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(cprofile_dir, f'{name}.prof'))
+    result = StageProfile(name, wall, records_in, len(records))
+    if profile:
+        result.alloc_peak = tracemalloc.get_traced_memory()[1] - baseline
+        result.touched = _touched(before, records)
+    return records, result
+
+
+def validate(records, limit=20):
+    """The validate_taxonomy check over the records in memory."""
+    taxonomy = load_taxonomy()
+    errors = ErrorBuffer(limit=limit)
+    for p in records:
+        error = taxonomy.check(p.get('patternLevel'), p.get('primaryPattern'), p.get('subPattern'))
+        if error:
+            errors.add(p, error)
+    return errors
+
+
+def run_pipeline(path, output=None, stages=STAGES, profile=False, cprofile_dir=None):
+    """Load `path`, apply `stages`, validate, and write to `output` (default `path`).
+
+    Returns (problem count, ErrorBuffer, [StageProfile]). Nothing is written
+    when validation fails.
+    """
+    if cprofile_dir:
+        os.makedirs(cprofile_dir, exist_ok=True)
+    if profile:
+        tracemalloc.start()
+    source = None
+    try:
+        started = time.perf_counter()
+        records, source = load_problems(path)
+        profiles = [StageProfile('load', time.perf_counter() - started, 0, len(records))]
+        for name, fn in stages:
+            records, result = run_stage(name, fn, records, profile, cprofile_dir)
+            profiles.append(result)
+        found = []
+
+        def check(records):
+            found.append(validate(records))
+            return records
+        records, result = run_stage('validate_taxonomy', check, records, profile, cprofile_dir)
+        profiles.append(result)
+        errors = found[0]
+        if errors:
+            return len(records), errors, profiles
+
+        started = time.perf_counter()
+        output = output or path
+        # Closes the source before the new file replaces it
+        save_problems(output, records, source)
+        update_facets(output, problems=records)
+        profiles.append(StageProfile('write', time.perf_counter() - started, len(records), len(records)))
+        return len(records), errors, profiles
+    finally:
+        if source is not None:
+            source.close()
+        if profile:
+            tracemalloc.stop()
+
+
+def print_profile(profiles):
+    print(f"{'stage':<24}{'wall':>10}{'in':>9}{'out':>9}{'touched':>9}{'alloc peak':>12}")
+    for r in profiles:
+        touched = '-' if r.touched is None else str(r.touched)
+        peak = '-' if r.alloc_peak is None else f"{r.alloc_peak / (1 << 20):.1f} MiB"
+        print(f"{r.name:<24}{r.wall_s * 1000:>8.1f}ms{r.records_in:>9}{r.records_out:>9}{touched:>9}{peak:>12}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run every data migration on problems.json in one pass.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('-o', '--output', help='write here instead of back to PATH')
+    parser.add_argument('--profile', action='store_true', help='report time, records changed and allocation peak per stage')
+    parser.add_argument('--cprofile', metavar='DIR', help='dump a cProfile file per stage into DIR')
+    args = parser.parse_args()
+
+    count, errors, profiles = run_pipeline(args.path, args.output, profile=args.profile, cprofile_dir=args.cprofile)
+    if args.profile or args.cprofile:
+        print_profile(profiles)
+    if args.cprofile:
+        print(f"cProfile dumps in {args.cprofile} (python -m pstats {os.path.join(args.cprofile, 'STAGE.prof')})")
+    if errors:
+        print(f"Validation failed with {errors.total} errors, nothing written:")
+        for e in errors.errors:
+            print(e)
+        if errors.total > len(errors.errors):
+            print("...")
+        sys.exit(1)
+    print(f"Pipeline complete: {count} problems written to {args.output or args.path}")
@@ -0,0 +1,156 @@
+import hashlib
+import inspect
+import json
+import os
+
+from problem_index import read_problems
+from problem_store import atomic_write, corpus_files, iter_problems, rewrite_problems
+
+# Content-hash cache for per-record corpus transforms.
+#
+# For every stage the manifest stores a fingerprint of the transform (the
+# source of the module defining it and of any helpers from other modules it
+# calls, listed in `deps`, plus the config tables it reads), a hash of the corpus as the
+# stage last left it, and one hash per record of the stage's output. On a
+# rerun an untouched corpus is skipped after a single file hash, and
+# otherwise only records whose hash moved are passed to the transform.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, '.cache')
+
+
+class Stage:
+    """A named per-record transform plus the config and code it depends on.
+
+    The whole module defining `transform` is fingerprinted, so an edit to any
+    helper beside it reruns the stage; functions or modules it calls from
+    elsewhere go in `deps`.
+    """
+
+    def __init__(self, name, transform, config=(), ids=None, deps=()):
+        self.name = name
+        self.transform = transform
+        self.config = config
+        self.ids = ids
+        self.deps = deps
+
+    def fingerprint(self):
+        h = hashlib.sha256()
+        for code in (inspect.getmodule(self.transform), self.transform, *self.deps):
+            h.update(inspect.getsource(code).encode('utf-8'))
+        h.update(json.dumps(self.config, sort_keys=True, default=repr).encode('utf-8'))
+        return h.hexdigest()
+
+
+class StageResult:
+    __slots__ = ('name', 'checked', 'changed', 'rewritten')
+
+    def __init__(self, name, checked=0, changed=(), rewritten=()):
+        self.name = name
+        self.checked = checked
+        # ids whose input differed from the manifest, and the subset the
+        # transform actually modified
+        self.changed = set(changed)
+        self.rewritten = set(rewritten)
+
+    def __str__(self):
+        if not self.checked:
+            return f"{self.name}: unchanged, skipped"
+        return (f"{self.name}: checked {self.checked}, {len(self.changed)} changed inputs, "
+                f"{len(self.rewritten)} records rewritten")
+
+
+def record_hash(record):
+    text = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def corpus_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    for name in corpus_files(path):
+        with open(name, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    return h.hexdigest()
+
+
+def manifest_path(path):
+    key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f'manifest-{key}.json')
+
+
+def load_manifest(path):
+    try:
+        with open(manifest_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with atomic_write(manifest_path(path)) as f:
+        json.dump(manifest, f, separators=(',', ':'))
+
+
+def run_stages(path, stages, force=False):
+    """Apply `stages` in order to the corpus at `path`, skipping records they already produced.
+
+    The stages are composed per record and cached as one unit, so two stages
+    that write the same field do not keep undoing each other between runs.
+    """
+    name = '+'.join(stage.name for stage in stages)
+    manifest = load_manifest(path)
+    fingerprint = hashlib.sha256(''.join(stage.fingerprint() for stage in stages).encode('ascii')).hexdigest()
+    entry = manifest.get(name)
+    if force or not entry or entry.get('transform') != fingerprint:
+        entry = {'transform': fingerprint, 'corpus': None, 'records': {}}
+
+    if entry['corpus'] == corpus_hash(path):
+        return StageResult(name)
+
+    # A stage limited to `ids` only sees those records
+    scopes = [set(stage.ids) if stage.ids is not None else None for stage in stages]
+    scoped = all(scope is not None for scope in scopes)
+    ids = set().union(*scopes) if scoped else None
+
+    def apply(p):
+        for stage, scope in zip(stages, scopes):
+            if scope is None or p['id'] in scope:
+                p = stage.transform(p)
+        return p
+
+    known = entry['records']
+    seen = {}
+    changed = set()
+    rewritten = set()
+    # A scoped run over a JSON file decodes just its records via the sidecar index
+    if ids is not None and os.path.isfile(path):
+        records = read_problems(path, ids)
+    else:
+        records = iter_problems(path, ids=ids)
+    for p in records:
+        key = str(p['id'])
+        before = record_hash(p)
+        if known.get(key) == before:
+            seen[key] = before
+            continue
+        changed.add(p['id'])
+        after = record_hash(apply(p))
+        if after != before:
+            rewritten.add(p['id'])
+        seen[key] = after
+
+    if rewritten:
+        rewrite_problems(path, apply, ids=rewritten)
+
+    entry['records'] = {**known, **seen} if scoped else seen
+    entry['corpus'] = corpus_hash(path)
+    manifest[name] = entry
+    save_manifest(path, manifest)
+    return StageResult(name, len(seen), changed, rewritten)
+
+
+def run_stage(path, stage, force=False):
+    """Apply a single `stage`, skipping records it already produced."""
+    return run_stages(path, [stage], force)
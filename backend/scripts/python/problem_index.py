@@ -0,0 +1,227 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+
+from problem_store import atomic_write
+
+# Random access into problems.json.
+#
+# A sidecar (problems.json.idx) holds two open-addressing hash tables, one
+# keyed by id and one by slug, mapping to the byte offset and length of the
+# record in the JSON file. Both files are mmapped, so a lookup is one probe
+# sequence plus a json.loads of a single record, whatever the corpus size.
+# The sidecar records the size and mtime of the file it was built from and
+# is rebuilt on the next lookup once they no longer match.
+
+MAGIC = b'PIDX\x00\x00\x00\x01'
+_HEADER = struct.Struct('<8sQQQQ')  # magic, source size, source mtime_ns, slots, records
+_SLOT = struct.Struct('<QQQ')  # key (0 = empty), offset, length
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# Strings are matched whole so brackets inside them are never counted
+_STRUCTURE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+
+
+def index_path_for(path):
+    return path + '.idx'
+
+
+def _id_key(pid):
+    # Key 0 marks an empty slot, so ids are shifted by one; negative ids
+    # would wrap onto others and are refused
+    if not 0 <= pid < _MASK:
+        raise ValueError(f"problem id {pid} is outside the indexable range 0..2^64-2")
+    return pid + 1
+
+
+def _slug_key(slug):
+    digest = hashlib.blake2b(slug.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+def _home(key, bits):
+    return ((key * _GOLDEN) & _MASK) >> (64 - bits)
+
+
+def iter_spans(data):
+    """Yield (offset, length) of every top-level element of a JSON array."""
+    depth = 0
+    start = 0
+    for m in _STRUCTURE.finditer(data):
+        ch = data[m.start()]
+        if ch == 0x22:
+            continue
+        if ch == 0x7B or ch == 0x5B:
+            depth += 1
+            if depth == 2:
+                start = m.start()
+        else:
+            if depth == 2:
+                yield start, m.end() - start
+            depth -= 1
+
+
+def _insert(table, bits, key, offset, length):
+    slots = 1 << bits
+    slot = _home(key, bits)
+    while True:
+        existing = _SLOT.unpack_from(table, slot * _SLOT.size)[0]
+        # A repeated key points at its last record, as in generate_problems
+        if existing == key or existing == 0:
+            _SLOT.pack_into(table, slot * _SLOT.size, key, offset, length)
+            return
+        slot = (slot + 1) & (slots - 1)
+
+
+def build_index(path, index_path=None):
+    """Scan `path` once and write its id/slug sidecar. Returns the record count."""
+    index_path = index_path or index_path_for(path)
+    st = os.stat(path)
+
+    entries = []
+    # An empty file cannot be mapped; it indexes as an empty corpus
+    if st.st_size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset, length in iter_spans(data):
+                record = json.loads(data[offset:offset + length])
+                entries.append((record.get('id'), record.get('slug'), offset, length))
+
+    bits = max(3, (2 * len(entries) - 1).bit_length())
+    id_table = bytearray(_SLOT.size << bits)
+    slug_table = bytearray(_SLOT.size << bits)
+    for pid, slug, offset, length in entries:
+        if isinstance(pid, int):
+            _insert(id_table, bits, _id_key(pid), offset, length)
+        if isinstance(slug, str):
+            _insert(slug_table, bits, _slug_key(slug), offset, length)
+
+    with atomic_write(index_path, binary=True) as f:
+        f.write(_HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, 1 << bits, len(entries)))
+        f.write(id_table)
+        f.write(slug_table)
+    return len(entries)
+
+
+class ProblemIndex:
+    """O(1) lookups of single problems by id or slug."""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or index_path_for(path)
+        self._files = []
+        self._stamp = None
+        self._open()
+
+    def _read_header(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                header = f.read(_HEADER.size)
+        except OSError:
+            return None
+        if len(header) < _HEADER.size:
+            return None
+        header = _HEADER.unpack(header)
+        return header if header[0] == MAGIC else None
+
+    def _open(self):
+        st = os.stat(self.path)
+        header = self._read_header()
+        if header is None or header[1:3] != (st.st_size, st.st_mtime_ns):
+            build_index(self.path, self.index_path)
+            header = self._read_header()
+
+        self._stamp = header[1:3]
+        self._slots = header[3]
+        self._bits = self._slots.bit_length() - 1
+        self.count = header[4]
+        for name in (self.path, self.index_path):
+            f = open(name, 'rb')
+            # An empty problems file has no spans to read; b'' stands in for its map
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+            self._files.append((f, mm))
+        self._data = self._files[0][1] if self._files[0][1] is not None else b''
+        self._index = self._files[1][1]
+
+    def close(self):
+        for f, mm in self._files:
+            if mm is not None:
+                mm.close()
+            f.close()
+        self._files = []
+
+    def refresh(self):
+        """Rebuild the sidecar if problems.json changed since it was built."""
+        st = os.stat(self.path)
+        if (st.st_size, st.st_mtime_ns) != self._stamp:
+            self.close()
+            self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _probe(self, table, key):
+        base = _HEADER.size + table * self._slots * _SLOT.size
+        slot = _home(key, self._bits)
+        while True:
+            found, offset, length = _SLOT.unpack_from(self._index, base + slot * _SLOT.size)
+            if found == key:
+                return offset, length
+            if found == 0:
+                return None
+            slot = (slot + 1) & (self._slots - 1)
+
+    def span(self, pid):
+        self.refresh()
+        # No id outside the key range is ever indexed
+        if not 0 <= pid < _MASK:
+            return None
+        return self._probe(0, _id_key(pid))
+
+    def slug_span(self, slug):
+        self.refresh()
+        return self._probe(1, _slug_key(slug))
+
+    def _decode(self, span):
+        if span is None:
+            return None
+        offset, length = span
+        return json.loads(self._data[offset:offset + length])
+
+    def get(self, pid):
+        return self._decode(self.span(pid))
+
+    def get_by_slug(self, slug):
+        record = self._decode(self.slug_span(slug))
+        # Guard against a 64-bit slug hash collision
+        return record if record is not None and record.get('slug') == slug else None
+
+
+def read_problems(path, ids):
+    """Decode only the records for `ids`, in file order."""
+    with ProblemIndex(path) as index:
+        spans = sorted(filter(None, (index.span(pid) for pid in set(ids))))
+        return [index._decode(span) for span in spans]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Look up single problems through the id/slug sidecar index.')
+    parser.add_argument('path')
+    parser.add_argument('keys', nargs='*', help='problem ids, or slugs with --slug')
+    parser.add_argument('--slug', action='store_true')
+    parser.add_argument('--rebuild', action='store_true')
+    args = parser.parse_intermixed_args()
+
+    if args.rebuild:
+        print(f"Indexed {build_index(args.path)} problems.")
+    with ProblemIndex(args.path) as index:
+        for key in args.keys:
+            record = index.get_by_slug(key) if args.slug else index.get(int(key))
+            print(json.dumps(record, indent=2, ensure_ascii=False) if record else f"{key}: not found")
@@ -0,0 +1,262 @@
+import json
+import mmap
+import os
+import shutil
+import sys
+from collections.abc import MutableMapping
+
+from problem_index import iter_spans
+from problem_store import iter_problems, write_problems
+
+# A compact in-memory form of a problem record.
+#
+# A Problem keeps only what the per-record passes look at: id, slug, title,
+# tags and the categorical fields in CATEGORICAL. Categorical values are
+# stored as codes into one process-wide vocabulary per field, tags as
+# interned tuples shared by every record with the same tags, and the key
+# order as an interned tuple, so repeated values cost a pointer each.
+#
+# Everything else (statements, explanations, examples, steps...) stays in
+# the source file. load_problems() records the byte span of every record
+# and the first access to any other field decodes that one record from an
+# mmap. The mapping stays open until the Source is closed; save_problems()
+# writes the new corpus next to the source and closes the mapping before
+# moving it into place, as Windows cannot replace a file that is mapped.
+#
+# Problem is a MutableMapping, so the existing transforms, which use
+# p.get(), p[key] and p[key] = value, run on it unchanged. As with a dict,
+# p['tags'] is the record's own list and p['tags'].append(x) sticks: the
+# first read swaps the shared tuple for a list kept on the record, so only
+# records whose tags are read (or assigned) pay for one.
+
+CATEGORICAL = ('difficulty', 'algorithmType', 'status', 'patternLevel', 'primaryPattern', 'subPattern')
+LIGHT = frozenset(('id', 'slug', 'title', 'tags') + CATEGORICAL)
+_MISSING = 0
+# Pages of the source already parsed are released every RELEASE_BYTES
+RELEASE_BYTES = 64 << 20
+
+
+class Vocabulary:
+    """Value <-> small int code for one field; code 0 means the key is absent."""
+
+    def __init__(self):
+        self.values = [None]
+        self._codes = {}
+
+    def encode(self, value):
+        try:
+            # The type is part of the key so 1, 1.0 and True stay distinct
+            key = (type(value), value)
+            code = self._codes.get(key)
+        except TypeError:
+            # Lists and dicts are stored as they are, one entry each
+            key = code = None
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            if key is not None:
+                self._codes[key] = code
+        return code
+
+    def __len__(self):
+        return len(self.values) - 1
+
+
+VOCABULARIES = {field: Vocabulary() for field in CATEGORICAL}
+_interned = {}
+
+
+def _intern(value):
+    return _interned.setdefault(value, value)
+
+
+def _intern_tags(tags):
+    if isinstance(tags, list) and all(isinstance(t, str) for t in tags):
+        return _intern(tuple(sys.intern(t) for t in tags))
+    return tags
+
+
+class _Coded:
+    """A categorical field stored as a code in the slot '_' + field."""
+
+    def __init__(self, field):
+        self.field = field
+        self.slot = '_' + field
+        self.vocabulary = VOCABULARIES[field]
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return self.vocabulary.values[getattr(obj, self.slot)]
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, self.vocabulary.encode(value))
+
+
+class Source:
+    """The mmapped file the heavy fields of a set of Problems are decoded from."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def decode(self, offset, length):
+        return json.loads(self.data[offset:offset + length])
+
+    def release(self, end):
+        # Parsed pages are file-backed; dropping them only lowers resident memory
+        if hasattr(self.data, 'madvise') and hasattr(mmap, 'MADV_DONTNEED'):
+            self.data.madvise(mmap.MADV_DONTNEED, 0, end - end % mmap.PAGESIZE)
+
+    def close(self):
+        if not self.data.closed:
+            self.data.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Problem(MutableMapping):
+    __slots__ = ('id', 'slug', 'title', '_tags', '_keys', '_source', '_offset', '_length', '_rest') + tuple(
+        '_' + field for field in CATEGORICAL)
+
+    def __init__(self, record, source=None, offset=0, length=0):
+        self._keys = _intern(tuple(sys.intern(k) for k in record))
+        self.id = record.get('id')
+        self.slug = record.get('slug')
+        self.title = record.get('title')
+        self._tags = _intern_tags(record.get('tags'))
+        for field in CATEGORICAL:
+            setattr(self, field, record[field]) if field in record else setattr(self, '_' + field, _MISSING)
+        self._source = source
+        self._offset = offset
+        self._length = length
+        # Without a source the heavy fields have nowhere to be reloaded from
+        self._rest = None if source is not None else {k: v for k, v in record.items() if k not in LIGHT}
+
+    def _heavy(self):
+        if self._rest is None:
+            record = self._source.decode(self._offset, self._length)
+            self._rest = {k: v for k, v in record.items() if k not in LIGHT}
+        return self._rest
+
+    def __getitem__(self, key):
+        if key not in LIGHT:
+            return self._heavy()[key]
+        if key not in self._keys:
+            raise KeyError(key)
+        if key == 'tags':
+            if isinstance(self._tags, tuple):
+                self._tags = list(self._tags)
+            return self._tags
+        return getattr(self, key)
+
+    def _light(self, key):
+        # Like self[key], without giving the record its own tags list
+        if key == 'tags' and isinstance(self._tags, tuple):
+            return list(self._tags)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        if key in LIGHT:
+            if key == 'tags':
+                # Kept as given, so later changes to `value` show through
+                self._tags = value
+            else:
+                setattr(self, key, value)
+        else:
+            self._heavy()[key] = value
+        if key not in self._keys:
+            self._keys = _intern(self._keys + (sys.intern(key),))
+
+    def __delitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in CATEGORICAL:
+            setattr(self, '_' + key, _MISSING)
+        elif key not in LIGHT:
+            del self._heavy()[key]
+        self._keys = _intern(tuple(k for k in self._keys if k != key))
+
+    def __contains__(self, key):
+        # Membership never needs the heavy fields
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"<Problem {self.id} {self.slug!r}>"
+
+    def to_dict(self):
+        """A plain dict in the original key order; heavy fields are decoded but not kept."""
+        rest = self._rest if self._rest is not None else self._source.decode(self._offset, self._length)
+        return {k: (self._light(k) if k in LIGHT else rest[k]) for k in self._keys}
+
+
+# Declared after the class body so they do not clash with __slots__
+for _field in CATEGORICAL:
+    setattr(Problem, _field, _Coded(_field))
+
+
+def as_dict(p):
+    return p.to_dict() if isinstance(p, Problem) else p
+
+
+def load_problems(path):
+    """Every problem at `path` as a Problem, in file order; returns (problems, source).
+
+    A JSON array file is scanned once and its heavy fields are left on disk,
+    to be read through `source` until it is closed. A shard directory has no
+    stable byte spans, so its records are loaded in full and source is None,
+    as it is for an empty file.
+    """
+    if os.path.isdir(path):
+        return [Problem(record) for record in iter_problems(path)], None
+    if os.path.getsize(path) == 0:
+        return [], None
+    source = Source(path)
+    problems = []
+    released = 0
+    try:
+        for offset, length in iter_spans(source.data):
+            problems.append(Problem(source.decode(offset, length), source, offset, length))
+            if offset - released > RELEASE_BYTES:
+                source.release(offset)
+                released = offset
+        source.release(len(source.data))
+    except BaseException:
+        source.close()
+        raise
+    return problems, source
+
+
+def save_problems(path, problems, source=None):
+    """write_problems() for Problems read through `source`, which is closed before the swap."""
+    if source is None or os.path.isdir(path):
+        try:
+            return write_problems(path, map(as_dict, problems))
+        finally:
+            if source is not None:
+                source.close()
+    staged = f'{path}.{os.getpid()}.new'
+    try:
+        count = write_problems(staged, map(as_dict, problems))
+        if os.path.exists(path):
+            shutil.copymode(path, staged)
+        source.close()
+        os.replace(staged, path)
+    except BaseException:
+        source.close()
+        if os.path.exists(staged):
+            os.unlink(staged)
+        raise
+    return count
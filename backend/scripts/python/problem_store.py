@@ -0,0 +1,316 @@
+import json
+import os
+import stat
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# Streaming access to the problems corpus.
+#
+# The corpus lives either in a single JSON array (problems.json) or in a
+# sharded NDJSON directory (one record per line, one file per id range).
+# Both layouts are read one record at a time and rewritten through a temp
+# file that is swapped in with os.replace, so a crashed migration never
+# leaves a half-written corpus behind.
+
+CHUNK_SIZE = 1 << 16
+SHARD_SIZE = 1000
+SHARD_SUFFIX = '.ndjson'
+
+_WS = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+@contextmanager
+def atomic_write(path, encoding='utf-8', binary=False):
+    """Open a temp file next to `path` and move it over `path` on success."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        # mkstemp creates 0600 files; keep the mode the target already had
+        if os.path.exists(path):
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding=encoding, newline='')) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _iter_json_array(f, chunk_size=CHUNK_SIZE):
+    buf, pos, eof = '', 0, False
+
+    def more():
+        nonlocal buf, pos, eof
+        # Grow the read size with the pending buffer so one huge record is
+        # not re-decoded once per small chunk.
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ''
+            more()
+
+    if peek() != '[':
+        raise ValueError('expected a JSON array of problems')
+    pos += 1
+    if peek() == ']':
+        return
+
+    while True:
+        peek()
+        while True:
+            try:
+                record, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more()
+                continue
+            # A scalar that ends exactly at the buffer edge may be truncated.
+            if end == len(buf) and not eof and not isinstance(record, (dict, list)):
+                more()
+                continue
+            break
+        pos = end
+        yield record
+
+        c = peek()
+        if c == ',':
+            pos += 1
+        elif c == ']':
+            return
+        else:
+            raise ValueError(f"expected ',' or ']' in problems array, got {c!r}")
+
+
+def chunked(iterable, size):
+    """Group an iterable into lists of at most `size` items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _shard_path(directory, shard):
+    return os.path.join(directory, f'shard-{shard:05d}{SHARD_SUFFIX}')
+
+
+def shard_of(pid):
+    return pid // SHARD_SIZE
+
+
+def list_shards(directory):
+    shards = []
+    for name in os.listdir(directory):
+        if name.startswith('shard-') and name.endswith(SHARD_SUFFIX):
+            shards.append(int(name[len('shard-'):-len(SHARD_SUFFIX)]))
+    return sorted(shards)
+
+
+def corpus_files(path):
+    """The files backing a corpus: the JSON file itself or every shard."""
+    if os.path.isdir(path):
+        return [_shard_path(path, shard) for shard in list_shards(path)]
+    return [path]
+
+
+def _read_shard(directory, shard):
+    path = _shard_path(directory, shard)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f if line.strip()]
+
+
+def _write_shard(directory, shard, lines):
+    path = _shard_path(directory, shard)
+    if not lines:
+        if os.path.exists(path):
+            os.unlink(path)
+        return
+    with atomic_write(path) as f:
+        for line in lines:
+            f.write(line)
+            f.write('\n')
+
+
+def _encode_line(record, ensure_ascii=True):
+    return json.dumps(record, ensure_ascii=ensure_ascii, separators=(',', ':'))
+
+
+def iter_problems(path, ids=None):
+    """Yield problems one at a time from a JSON array file or a shard directory.
+
+    With `ids`, only matching records are yielded; in the sharded layout only
+    the shards that can hold those ids are opened.
+    """
+    wanted = set(ids) if ids is not None else None
+    if os.path.isdir(path):
+        shards = list_shards(path)
+        if wanted is not None:
+            shards = sorted({shard_of(i) for i in wanted}.intersection(shards))
+        for shard in shards:
+            for line in _read_shard(path, shard):
+                record = json.loads(line)
+                if wanted is None or record.get('id') in wanted:
+                    yield record
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for record in _iter_json_array(f):
+            if wanted is None or record.get('id') in wanted:
+                yield record
+
+
+def _write_json_array(f, records, indent=2, ensure_ascii=True):
+    # Byte-identical to json.dump(list(records), f, indent=indent), written
+    # one record at a time.
+    count = 0
+    pad = ' ' * indent if indent else ''
+    for record in records:
+        text = json.dumps(record, indent=indent, ensure_ascii=ensure_ascii)
+        if indent:
+            f.write('[\n' + pad if count == 0 else ',\n' + pad)
+            f.write(text.replace('\n', '\n' + pad))
+        else:
+            f.write('[' if count == 0 else ', ')
+            f.write(text)
+        count += 1
+    if count == 0:
+        f.write('[]')
+    else:
+        f.write('\n]' if indent else ']')
+    return count
+
+
+def write_problems(path, records, indent=2, ensure_ascii=True):
+    """Atomically write an iterable of problems to `path` (file or shard directory)."""
+    if os.path.isdir(path):
+        by_shard = {}
+        for record in records:
+            by_shard.setdefault(shard_of(record['id']), []).append(_encode_line(record, ensure_ascii))
+        for shard in set(list_shards(path)) - set(by_shard):
+            _write_shard(path, shard, [])
+        for shard, lines in by_shard.items():
+            if lines != _read_shard(path, shard):
+                _write_shard(path, shard, lines)
+        return sum(len(lines) for lines in by_shard.values())
+
+    with atomic_write(path) as f:
+        return _write_json_array(f, records, indent=indent, ensure_ascii=ensure_ascii)
+
+
+def rewrite_problems(path, transform, tail=None, ids=None, indent=2, ensure_ascii=True):
+    """Stream every problem through `transform` and atomically replace the corpus.
+
+    `transform(problem)` returns the record to keep (usually the same dict,
+    mutated) or None to drop it. When `ids` is given, only those records are
+    passed to `transform`; the rest are copied through unchanged. `tail()`
+    is called once the existing records are exhausted and may yield new
+    problems to append.
+
+    Returns the number of records written.
+    """
+    wanted = set(ids) if ids is not None else None
+
+    def apply(record):
+        if wanted is not None and record.get('id') not in wanted:
+            return record
+        return transform(record)
+
+    if os.path.isdir(path):
+        return _rewrite_shards(path, apply, tail, wanted, ensure_ascii)
+
+    def records():
+        for record in iter_problems(path):
+            record = apply(record)
+            if record is not None:
+                yield record
+        if tail is not None:
+            yield from tail()
+
+    with atomic_write(path) as f:
+        return _write_json_array(f, records(), indent=indent, ensure_ascii=ensure_ascii)
+
+
+def _rewrite_shards(directory, apply, tail, wanted, ensure_ascii):
+    shards = list_shards(directory)
+    if wanted is not None:
+        shards = sorted({shard_of(i) for i in wanted}.intersection(shards))
+
+    pending = {}
+    written = 0
+    for shard in shards:
+        before = _read_shard(directory, shard)
+        after = []
+        for line in before:
+            record = apply(json.loads(line))
+            if record is not None:
+                after.append(_encode_line(record, ensure_ascii))
+        pending[shard] = (before, after)
+
+    if tail is not None:
+        for record in tail():
+            shard = shard_of(record['id'])
+            if shard not in pending:
+                lines = _read_shard(directory, shard)
+                pending[shard] = (lines, list(lines))
+            pending[shard][1].append(_encode_line(record, ensure_ascii))
+
+    # Untouched shards are never rewritten, so their mtimes stay put.
+    for shard, (before, after) in pending.items():
+        if after != before:
+            _write_shard(directory, shard, after)
+        written += len(after)
+    return written
+
+
+def split_into_shards(json_path, directory, ensure_ascii=True):
+    """Convert a problems.json array into the sharded NDJSON layout."""
+    os.makedirs(directory, exist_ok=True)
+    by_shard = {}
+    for record in iter_problems(json_path):
+        by_shard.setdefault(shard_of(record['id']), []).append(_encode_line(record, ensure_ascii))
+    for shard, lines in by_shard.items():
+        _write_shard(directory, shard, lines)
+    return sum(len(lines) for lines in by_shard.values())
+
+
+def join_shards(directory, json_path, indent=2, ensure_ascii=True):
+    """Convert a sharded NDJSON directory back into a single JSON array."""
+    with atomic_write(json_path) as f:
+        return _write_json_array(f, iter_problems(directory), indent=indent, ensure_ascii=ensure_ascii)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[1] not in ('split', 'join'):
+        print('usage: problem_store.py split <problems.json> <shard_dir>')
+        print('       problem_store.py join <shard_dir> <problems.json>')
+        sys.exit(1)
+
+    command, src, dst = sys.argv[1:]
+    if command == 'split':
+        count = split_into_shards(src, dst)
+    else:
+        count = join_shards(src, dst)
+    print(f"Wrote {count} problems to {dst}.")
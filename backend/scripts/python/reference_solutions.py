@@ -0,0 +1,527 @@
+import random
+
+# Reference brute-force and optimal solutions, keyed by problem slug.
+#
+# These are what verify_complexity.py times. Each pair solves the problem
+# the way its brute_force_explanation / optimal_explanation describes, so
+# the measured growth reflects the approach the problem claims. A
+# `worst_case(n, rng)` builder overrides the inputs generated from
+# labConfig/input_settings where the running time depends on the input's
+# shape (a missing target, all-distinct characters, an unreachable end).
+
+
+class Reference:
+    __slots__ = ('brute', 'optimal', 'worst_case', 'mutates')
+
+    def __init__(self, brute, optimal, worst_case=None, mutates=False):
+        self.brute = brute
+        self.optimal = optimal
+        self.worst_case = worst_case
+        # Solutions that modify their input get a fresh copy for every call
+        self.mutates = mutates
+
+
+def _distinct(n, rng):
+    values = list(range(-n, n))
+    rng.shuffle(values)
+    return values[:n]
+
+
+def two_sum_brute(nums, target):
+    for i in range(len(nums)):
+        for j in range(i + 1, len(nums)):
+            if nums[i] + nums[j] == target:
+                return [i, j]
+    return []
+
+
+def two_sum_optimal(nums, target):
+    seen = {}
+    for i, x in enumerate(nums):
+        if target - x in seen:
+            return [seen[target - x], i]
+        seen[x] = i
+    return []
+
+
+def longest_substring_brute(s):
+    best = 0
+    for i in range(len(s)):
+        seen = set()
+        for ch in s[i:]:
+            if ch in seen:
+                break
+            seen.add(ch)
+        best = max(best, len(seen))
+    return best
+
+
+def longest_substring_optimal(s):
+    last = {}
+    best = start = 0
+    for i, ch in enumerate(s):
+        if last.get(ch, -1) >= start:
+            start = last[ch] + 1
+        last[ch] = i
+        best = max(best, i - start + 1)
+    return best
+
+
+def _is_palindrome(s, lo, hi):
+    while lo < hi:
+        if s[lo] != s[hi]:
+            return False
+        lo += 1
+        hi -= 1
+    return True
+
+
+def longest_palindrome_brute(s):
+    best = (0, 0)
+    for i in range(len(s)):
+        for j in range(i, len(s)):
+            if _is_palindrome(s, i, j) and j + 1 - i > best[1] - best[0]:
+                best = (i, j + 1)
+    return s[best[0]:best[1]]
+
+
+def longest_palindrome_optimal(s):
+    best = (0, 0)
+    for center in range(2 * len(s) - 1):
+        lo, hi = center // 2, center // 2 + center % 2
+        while lo >= 0 and hi < len(s) and s[lo] == s[hi]:
+            lo -= 1
+            hi += 1
+        if hi - lo - 1 > best[1] - best[0]:
+            best = (lo + 1, hi)
+    return s[best[0]:best[1]]
+
+
+def container_brute(heights):
+    return max((min(heights[i], heights[j]) * (j - i)
+                for i in range(len(heights)) for j in range(i + 1, len(heights))), default=0)
+
+
+def container_optimal(heights):
+    l, r, best = 0, len(heights) - 1, 0
+    while l < r:
+        best = max(best, min(heights[l], heights[r]) * (r - l))
+        if heights[l] < heights[r]:
+            l += 1
+        else:
+            r -= 1
+    return best
+
+
+def three_sum_brute(nums):
+    found = set()
+    for i in range(len(nums)):
+        for j in range(i + 1, len(nums)):
+            for k in range(j + 1, len(nums)):
+                if nums[i] + nums[j] + nums[k] == 0:
+                    found.add(tuple(sorted((nums[i], nums[j], nums[k]))))
+    return sorted(found)
+
+
+def three_sum_optimal(nums):
+    nums = sorted(nums)
+    found = []
+    for i in range(len(nums) - 2):
+        if i and nums[i] == nums[i - 1]:
+            continue
+        l, r = i + 1, len(nums) - 1
+        while l < r:
+            total = nums[i] + nums[l] + nums[r]
+            if total < 0:
+                l += 1
+            elif total > 0:
+                r -= 1
+            else:
+                found.append((nums[i], nums[l], nums[r]))
+                while l < r and nums[l] == nums[l + 1]:
+                    l += 1
+                l += 1
+                r -= 1
+    return found
+
+
+def valid_parentheses_brute(s):
+    previous = None
+    while s and s != previous:
+        previous = s
+        s = s.replace('()', '').replace('[]', '').replace('{}', '')
+    return not s
+
+
+def valid_parentheses_optimal(s):
+    pairs = {')': '(', ']': '[', '}': '{'}
+    stack = []
+    for ch in s:
+        if ch in pairs:
+            if not stack or stack.pop() != pairs[ch]:
+                return False
+        else:
+            stack.append(ch)
+    return not stack
+
+
+def rotated_search_brute(nums, target):
+    for i, x in enumerate(nums):
+        if x == target:
+            return i
+    return -1
+
+
+def rotated_search_optimal(nums, target):
+    lo, hi = 0, len(nums) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if nums[mid] == target:
+            return mid
+        if nums[lo] <= nums[mid]:
+            if nums[lo] <= target < nums[mid]:
+                hi = mid - 1
+            else:
+                lo = mid + 1
+        elif nums[mid] < target <= nums[hi]:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+
+
+def max_subarray_brute(nums):
+    best = nums[0]
+    for i in range(len(nums)):
+        total = 0
+        for j in range(i, len(nums)):
+            total += nums[j]
+            best = max(best, total)
+    return best
+
+
+def max_subarray_optimal(nums):
+    best = current = nums[0]
+    for x in nums[1:]:
+        current = max(x, current + x)
+        best = max(best, current)
+    return best
+
+
+def jump_game_brute(nums):
+    def reach(i):
+        if i >= len(nums) - 1:
+            return True
+        return any(reach(i + step) for step in range(1, nums[i] + 1))
+    return reach(0)
+
+
+def jump_game_optimal(nums):
+    furthest = 0
+    for i, x in enumerate(nums):
+        if i > furthest:
+            return False
+        furthest = max(furthest, i + x)
+    return True
+
+
+def merge_intervals_brute(intervals):
+    merged = [list(iv) for iv in intervals]
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] <= b[1] and b[0] <= a[1]:
+                    merged[i] = [min(a[0], b[0]), max(a[1], b[1])]
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return sorted(merged)
+
+
+def merge_intervals_optimal(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+# Counts are kept modulo 2^64: exact Fibonacci numbers grow to n bits, and
+# the declared bounds assume constant-time addition
+WORD = (1 << 64) - 1
+
+
+def climbing_stairs_brute(n):
+    return 1 if n <= 1 else (climbing_stairs_brute(n - 1) + climbing_stairs_brute(n - 2)) & WORD
+
+
+def climbing_stairs_optimal(n):
+    a, b = 1, 1
+    for _ in range(n - 1):
+        a, b = b, (a + b) & WORD
+    return b
+
+
+def sort_colors_brute(nums):
+    counts = [nums.count(c) for c in (0, 1, 2)]
+    nums[:] = [0] * counts[0] + [1] * counts[1] + [2] * counts[2]
+
+
+def sort_colors_optimal(nums):
+    lo, mid, hi = 0, 0, len(nums) - 1
+    while mid <= hi:
+        if nums[mid] == 0:
+            nums[lo], nums[mid] = nums[mid], nums[lo]
+            lo += 1
+            mid += 1
+        elif nums[mid] == 1:
+            mid += 1
+        else:
+            nums[mid], nums[hi] = nums[hi], nums[mid]
+            hi -= 1
+
+
+def valid_palindrome_brute(s):
+    cleaned = ''.join(ch.lower() for ch in s if ch.isalnum())
+    return cleaned == cleaned[::-1]
+
+
+def valid_palindrome_optimal(s):
+    l, r = 0, len(s) - 1
+    while l < r:
+        if not s[l].isalnum():
+            l += 1
+        elif not s[r].isalnum():
+            r -= 1
+        elif s[l].lower() != s[r].lower():
+            return False
+        else:
+            l += 1
+            r -= 1
+    return True
+
+
+def move_zeroes_brute(nums):
+    nums[:] = [x for x in nums if x] + [0] * nums.count(0)
+
+
+def move_zeroes_optimal(nums):
+    write = 0
+    for x in nums:
+        if x:
+            nums[write] = x
+            write += 1
+    for i in range(write, len(nums)):
+        nums[i] = 0
+
+
+def stock_brute(prices):
+    return max((prices[j] - prices[i] for i in range(len(prices)) for j in range(i + 1, len(prices))), default=0)
+
+
+def stock_optimal(prices):
+    low, best = float('inf'), 0
+    for p in prices:
+        low = min(low, p)
+        best = max(best, p - low)
+    return best
+
+
+def contains_duplicate_brute(nums):
+    return any(nums[i] == nums[j] for i in range(len(nums)) for j in range(i + 1, len(nums)))
+
+
+def contains_duplicate_optimal(nums):
+    return len(set(nums)) < len(nums)
+
+
+def product_except_self_brute(nums):
+    out = []
+    for i in range(len(nums)):
+        product = 1
+        for j, x in enumerate(nums):
+            if j != i:
+                product *= x
+        out.append(product)
+    return out
+
+
+def product_except_self_optimal(nums):
+    out = [1] * len(nums)
+    prefix = 1
+    for i, x in enumerate(nums):
+        out[i] = prefix
+        prefix *= x
+    suffix = 1
+    for i in range(len(nums) - 1, -1, -1):
+        out[i] *= suffix
+        suffix *= nums[i]
+    return out
+
+
+def majority_brute(nums):
+    for x in nums:
+        if nums.count(x) > len(nums) // 2:
+            return x
+
+
+def majority_optimal(nums):
+    candidate, count = None, 0
+    for x in nums:
+        if count == 0:
+            candidate = x
+        count += 1 if x == candidate else -1
+    return candidate
+
+
+def daily_temperatures_brute(temps):
+    out = [0] * len(temps)
+    for i in range(len(temps)):
+        for j in range(i + 1, len(temps)):
+            if temps[j] > temps[i]:
+                out[i] = j - i
+                break
+    return out
+
+
+def daily_temperatures_optimal(temps):
+    out = [0] * len(temps)
+    stack = []
+    for i, t in enumerate(temps):
+        while stack and temps[stack[-1]] < t:
+            j = stack.pop()
+            out[j] = i - j
+        stack.append(i)
+    return out
+
+
+def subarray_sum_brute(nums, k):
+    count = 0
+    for i in range(len(nums)):
+        total = 0
+        for j in range(i, len(nums)):
+            total += nums[j]
+            count += total == k
+    return count
+
+
+def subarray_sum_optimal(nums, k):
+    seen = {0: 1}
+    count = total = 0
+    for x in nums:
+        total += x
+        count += seen.get(total - k, 0)
+        seen[total] = seen.get(total, 0) + 1
+    return count
+
+
+def binary_search_brute(nums, target):
+    return rotated_search_brute(nums, target)
+
+
+def binary_search_optimal(nums, target):
+    lo, hi = 0, len(nums) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if nums[mid] == target:
+            return mid
+        if nums[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+
+
+def _rotated(n, rng):
+    values = sorted(rng.sample(range(4 * n), n))
+    pivot = rng.randrange(n)
+    return values[pivot:] + values[:pivot], -1
+
+
+def _disjoint_intervals(n, rng):
+    intervals = [[3 * i, 3 * i + 1] for i in range(n)]
+    rng.shuffle(intervals)
+    return (intervals,)
+
+
+REFERENCES = {
+    # A missing target makes both loops run to the end
+    'two-sum': Reference(two_sum_brute, two_sum_optimal, lambda n, rng: (_distinct(n, rng), 4 * n)),
+    'longest-substring-without-repeating-characters': Reference(
+        longest_substring_brute, longest_substring_optimal,
+        lambda n, rng: (''.join(chr(0x4e00 + i) for i in rng.sample(range(n), n)),)),
+    'longest-palindromic-substring': Reference(longest_palindrome_brute, longest_palindrome_optimal,
+                                               lambda n, rng: ('a' * n,)),
+    'container-with-most-water': Reference(container_brute, container_optimal),
+    '3sum': Reference(three_sum_brute, three_sum_optimal),
+    'valid-parentheses': Reference(valid_parentheses_brute, valid_parentheses_optimal,
+                                   lambda n, rng: ('(' * (n // 2) + ')' * (n // 2),)),
+    'search-in-rotated-sorted-array': Reference(rotated_search_brute, rotated_search_optimal, _rotated),
+    'maximum-subarray': Reference(max_subarray_brute, max_subarray_optimal),
+    # Every path dies one short of the end, so the recursion explores all of them
+    'jump-game': Reference(jump_game_brute, jump_game_optimal, lambda n, rng: ([2] * max(n - 3, 0) + [1, 0, 0],)),
+    'merge-intervals': Reference(merge_intervals_brute, merge_intervals_optimal, _disjoint_intervals),
+    'climbing-stairs': Reference(climbing_stairs_brute, climbing_stairs_optimal, lambda n, rng: (n,)),
+    'sort-colors': Reference(sort_colors_brute, sort_colors_optimal,
+                             lambda n, rng: ([rng.randrange(3) for _ in range(n)],), mutates=True),
+    'valid-palindrome': Reference(valid_palindrome_brute, valid_palindrome_optimal,
+                                  lambda n, rng: ('ab, c' * (n // 10) + 'c ,ba' * (n // 10),)),
+    'move-zeroes': Reference(move_zeroes_brute, move_zeroes_optimal, mutates=True),
+    'best-time-to-buy-and-sell-stock': Reference(stock_brute, stock_optimal,
+                                                 lambda n, rng: ([rng.randrange(10000) for _ in range(n)],)),
+    'contains-duplicate': Reference(contains_duplicate_brute, contains_duplicate_optimal,
+                                    lambda n, rng: (_distinct(n, rng),)),
+    'product-of-array-except-self': Reference(product_except_self_brute, product_except_self_optimal,
+                                              lambda n, rng: ([rng.choice((-1, 1)) for _ in range(n)],)),
+    'majority-element': Reference(majority_brute, majority_optimal,
+                                  lambda n, rng: (_distinct(n - n // 2 - 1, rng) + [7 * n] * (n // 2 + 1),)),
+    # Falling temperatures never find a warmer day
+    'daily-temperatures': Reference(daily_temperatures_brute, daily_temperatures_optimal,
+                                    lambda n, rng: (list(range(n, 0, -1)),)),
+    'subarray-sum-equals-k': Reference(subarray_sum_brute, subarray_sum_optimal,
+                                       lambda n, rng: ([rng.randrange(-10, 11) for _ in range(n)], 7)),
+    'binary-search': Reference(binary_search_brute, binary_search_optimal,
+                               lambda n, rng: (list(range(n)), -1)),
+}
+
+
+def generate_inputs(problem, n, seed=0):
+    """Arguments of size `n` for `problem`'s reference solutions.
+
+    The worst-case builder wins; otherwise every labConfig parameter (or
+    input_settings field) is scaled from its default: arrays and strings get
+    `n` elements drawn like the default's, numbers keep their default.
+    """
+    rng = random.Random(seed * 1000003 + n)
+    reference = REFERENCES[problem['slug']]
+    if reference.worst_case is not None:
+        return reference.worst_case(n, rng)
+
+    params = problem.get('labConfig', {}).get('parameters')
+    if params is None:
+        params = [{'type': s.get('type', 'array'), 'default': s.get('placeholder')}
+                  for s in problem.get('input_settings', {}).values()]
+    args = []
+    for param in params:
+        default = param.get('default', param.get('defaultValue'))
+        if isinstance(default, str) and param.get('type') == 'array':
+            default = [int(x) for x in default.strip('[]').split(',') if x.strip()]
+        if param.get('type') == 'array' and default and all(isinstance(x, int) for x in default):
+            lo, hi = min(default), max(default)
+            spread = max(hi - lo, n)
+            args.append([rng.randint(lo, lo + spread) for _ in range(n)])
+        elif param.get('type') == 'string' and default:
+            alphabet = sorted(set(default))
+            args.append(''.join(rng.choice(alphabet) for _ in range(n)))
+        elif param.get('type') == 'number':
+            args.append(default)
+        else:
+            raise ValueError(f"Problem {problem['id']}: cannot scale parameter {param!r}; give it a worst_case builder")
+    return tuple(args)
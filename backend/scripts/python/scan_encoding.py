@@ -0,0 +1,315 @@
+import argparse
+import bisect
+import glob
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from multiprocessing import Pool, cpu_count
+
+from problem_store import atomic_write
+
+# Encoding scanner for the JSON data files.
+#
+# Each file is mmapped and walked once by a single bytes regex that only
+# stops on runs of non-ASCII bytes and runs of \uXXXX escapes, so clean
+# ASCII is skipped at regex speed. Each run is decoded and checked for
+# invalid UTF-8, mojibake (UTF-8 that was read as cp1252 and saved again),
+# replacement characters and code points outside ALLOWED. Offsets are mapped
+# to line/column through a newline index and to the owning record through
+# the JSON structure, both built only for files that have findings. --fix
+# writes every repairable finding back, in the form (raw or escaped) it
+# was found in.
+
+DATA_FILES = [
+    'frontend/src/data/problems.json',
+    'frontend/src/data/foundations.json',
+    'frontend/src/data/mastery_drills.json',
+    'backend/data/problems.json',
+]
+META_GLOB = 'backend/*_meta.json'
+
+# Typography and math symbols the content uses on purpose,
+# plus accented Latin letters
+ALLOWED = (frozenset('²³⁰¹⁴⁵⁶⁷⁸⁹ⁿ–—‘’“”…•·×÷±≤≥≠≈→←↑↓↔√∞∑∈∉⌊⌋⌈⌉°αβθλπσΘΣΩ')
+           | frozenset(chr(c) for c in range(0xc0, 0x250) if chr(c).isalpha()))
+# Look-alikes that have a plain spelling the UI and complexity.py understand
+SUBSTITUTES = {
+    'ᴷ': '^K', 'ᴸ': '^L', 'ᴹ': '^M', 'ᴺ': '^N',
+    'ᵏ': '^k', 'ᵐ': '^m', 'ˆ': '^', '＾': '^',
+    '\u2212': '-', '\u00a0': ' ', '\u200b': '', '\ufeff': '',
+}
+
+# The lookahead lets the regex engine skip plain ASCII with a single charset test
+_RUN = re.compile(rb'(?=[\\\x80-\xff])(?:\\(?:\\|(u[0-9a-fA-F]{4}(?:\\u[0-9a-fA-F]{4})*))|([\x80-\xff]+))')
+_TOKEN = re.compile(rb'"((?:[^"\\]|\\.)*)"(\s*:)?|[\[\]{}]')
+_ID_VALUE = re.compile(rb'\s*("(?:[^"\\]|\\.)*"|-?\d+)')
+
+
+def _cp1252(byte):
+    try:
+        return bytes([byte]).decode('cp1252')
+    except UnicodeDecodeError:
+        return chr(byte)
+
+
+# Character -> the byte it was decoded from, for cp1252 and latin-1 readers
+_UNDECODE = {_cp1252(b): b for b in range(0x80, 0x100)}
+for _b in range(0x80, 0x100):
+    _UNDECODE.setdefault(chr(_b), _b)
+_LEADS = ''.join(c for c, b in _UNDECODE.items() if 0xc2 <= b <= 0xf4)
+_CONTINUATIONS = ''.join(c for c, b in _UNDECODE.items() if 0x80 <= b < 0xc0)
+_MOJIBAKE = re.compile(f'[{re.escape(_LEADS)}][{re.escape(_CONTINUATIONS)}]+')
+
+
+class Finding:
+    __slots__ = ('path', 'offset', 'end', 'kind', 'text', 'fix', 'escaped', 'raw', 'line', 'column', 'owner')
+
+    def __init__(self, offset, end, kind, text, fix, escaped):
+        self.path = None
+        self.offset = offset
+        self.end = end
+        self.kind = kind
+        self.text = text
+        self.fix = fix
+        self.escaped = escaped
+        self.raw = b''
+        self.line = self.column = 0
+        self.owner = None
+
+    def encoded_fix(self):
+        if self.escaped:
+            return json.dumps(self.fix)[1:-1].encode('ascii')
+        return self.fix.encode('utf-8')
+
+    def __str__(self):
+        text = f"{self.path}:{self.line}:{self.column}: {self.kind} {self.text!r} [{self.raw.hex(' ')}]"
+        if self.fix is not None:
+            text += f" -> {self.fix!r}"
+        if self.owner:
+            text += f" in {self.owner}"
+        return text
+
+
+def _unmojibake(text):
+    """Undo UTF-8 read as cp1252 at the start of `text`; returns (chars consumed, repaired) or None."""
+    raw = bytes(_UNDECODE[c] for c in text)
+    try:
+        fixed = raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start == 0:
+            return None
+        text = text[:e.start]
+        fixed = raw[:e.start].decode('utf-8')
+    # Text saved twice through the wrong codec needs more than one round
+    for _ in range(3):
+        again = _MOJIBAKE.fullmatch(fixed) and _unmojibake(fixed)
+        if not again or again[0] != len(fixed):
+            break
+        fixed = again[1]
+    return len(text), fixed
+
+
+def _check_text(text, offsets, escaped):
+    """Findings in decoded `text`; offsets[i] is the byte offset of text[i]."""
+    pos = 0
+    while pos < len(text):
+        ch = text[pos]
+        m = _MOJIBAKE.match(text, pos)
+        repaired = m and _unmojibake(m.group())
+        if repaired:
+            n, fix = repaired
+            yield Finding(offsets[pos], offsets[pos + n], 'mojibake', text[pos:pos + n], fix, escaped)
+            pos += n
+            continue
+        if ch == '\ufffd':
+            yield Finding(offsets[pos], offsets[pos + 1], 'replacement-char', ch, None, escaped)
+        elif '\ud800' <= ch <= '\udfff':
+            yield Finding(offsets[pos], offsets[pos + 1], 'lone-surrogate', ch, None, escaped)
+        elif ch > '\x7f' and ch not in ALLOWED:
+            yield Finding(offsets[pos], offsets[pos + 1], 'unexpected', ch, SUBSTITUTES.get(ch), escaped)
+        pos += 1
+
+
+def _check_escaped(run, start):
+    chars = []
+    offsets = []
+    units = [int(run[i + 2:i + 6], 16) for i in range(0, len(run), 6)]
+    i = 0
+    while i < len(units):
+        offsets.append(start + i * 6)
+        u = units[i]
+        if 0xd800 <= u < 0xdc00 and i + 1 < len(units) and 0xdc00 <= units[i + 1] < 0xe000:
+            chars.append(chr(0x10000 + ((u - 0xd800) << 10) + units[i + 1] - 0xdc00))
+            i += 2
+        else:
+            chars.append(chr(u))
+            i += 1
+    offsets.append(start + len(run))
+    return _check_text(''.join(chars), offsets, True)
+
+
+def _check_raw(run, start):
+    pos = 0
+    while pos < len(run):
+        try:
+            text = run[pos:].decode('utf-8')
+            bad = None
+        except UnicodeDecodeError as e:
+            text = run[pos:pos + e.start].decode('utf-8')
+            bad = (pos + e.start, pos + e.end)
+        offsets = [start + pos]
+        for ch in text:
+            offsets.append(offsets[-1] + len(ch.encode('utf-8')))
+        yield from _check_text(text, offsets, False)
+        if bad is None:
+            return
+        # A stray single byte is almost always cp1252/latin-1 text, e.g.
+        # b'\xb2' for '²'; a truncated multi-byte sequence has no safe fix
+        invalid = run[bad[0]:bad[1]]
+        fix = _cp1252(invalid[0]) if len(invalid) == 1 else None
+        yield Finding(start + bad[0], start + bad[1], 'invalid-utf8', invalid, fix, False)
+        pos = bad[1]
+
+
+def scan(data):
+    """Every finding in the bytes-like `data`, in file order."""
+    findings = []
+    for m in _RUN.finditer(data):
+        if m.group(1):
+            findings.extend(_check_escaped(m.group(), m.start()))
+        elif m.group(2):
+            findings.extend(_check_raw(m.group(2), m.start()))
+    return findings
+
+
+def newline_index(data):
+    newlines = array('Q')
+    pos = data.find(b'\n')
+    while pos != -1:
+        newlines.append(pos)
+        pos = data.find(b'\n', pos + 1)
+    return newlines
+
+
+def _locate(data, newlines, offset):
+    line = bisect.bisect_right(newlines, offset)
+    line_start = newlines[line - 1] + 1 if line else 0
+    column = len(data[line_start:offset].decode('utf-8', 'replace')) + 1
+    return line + 1, column
+
+
+def _owners(data, offsets):
+    """Label each of the sorted `offsets` with the ids of the records around it.
+
+    A container is labelled by its "id" field, or, directly under a root
+    object without one (mastery_drills.json), by its key.
+    """
+    stack = []  # [label, is_object] per open container
+    key = None
+    snapshots = []
+    targets = iter(offsets)
+    target = next(targets, None)
+    for m in _TOKEN.finditer(data):
+        while target is not None and target < m.start():
+            snapshots.append(list(stack))
+            target = next(targets, None)
+        ch = data[m.start()]
+        if ch == 0x22:
+            if m.group(2) is None:
+                continue
+            key = m.group(1)
+            if key == b'id' and stack and stack[-1][1] and stack[-1][0] is None:
+                value = _ID_VALUE.match(data, m.end())
+                if value:
+                    stack[-1][0] = str(json.loads(value.group(1)))
+        elif ch == 0x7B or ch == 0x5B:
+            label = None
+            if len(stack) == 1 and stack[0][1] and stack[0][0] is None and key is not None:
+                label = key.decode('utf-8', 'replace')
+            stack.append([label, ch == 0x7B])
+        elif stack:
+            stack.pop()
+    while target is not None:
+        snapshots.append(list(stack))
+        target = next(targets, None)
+    return ['/'.join(entry[0] for entry in snapshot if entry[0]) or None for snapshot in snapshots]
+
+
+def fix_file(path, findings):
+    """Write the repairable `findings` back into `path`; returns how many were fixed."""
+    fixable = [f for f in findings if f.fix is not None]
+    if not fixable:
+        return 0
+    with open(path, 'rb') as f:
+        data = bytearray(f.read())
+    for finding in reversed(fixable):
+        data[finding.offset:finding.end] = finding.encoded_fix()
+    try:
+        json.loads(data)  # never leave a file that no longer parses
+    except ValueError as e:
+        # UnicodeDecodeError included: an unfixable finding is still in there
+        print(f"{path}: not fixed, the result would not parse ({e})")
+        return 0
+    with atomic_write(path, binary=True) as f:
+        f.write(data)
+    return len(fixable)
+
+
+def scan_file(path, fix=False):
+    """Scan one file; returns (path, findings, fixed count, elapsed ms)."""
+    started = time.perf_counter()
+    findings = []
+    if os.path.getsize(path):
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            findings = scan(data)
+            if findings:
+                newlines = newline_index(data)
+                owners = _owners(data, [f.offset for f in findings])
+                for finding, owner in zip(findings, owners):
+                    finding.path = path
+                    finding.raw = data[finding.offset:finding.end]
+                    finding.line, finding.column = _locate(data, newlines, finding.offset)
+                    finding.owner = owner
+    fixed = fix_file(path, findings) if fix else 0
+    return path, findings, fixed, (time.perf_counter() - started) * 1000
+
+
+def data_files():
+    return [p for p in DATA_FILES + sorted(glob.glob(META_GLOB)) if os.path.isfile(p)]
+
+
+def _scan_file(args):
+    return scan_file(*args)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Find invalid UTF-8, mojibake and unexpected characters in the data files.')
+    parser.add_argument('paths', nargs='*', help='files to scan (default: every JSON data file)')
+    parser.add_argument('--fix', action='store_true', help='rewrite the repairable findings in place')
+    parser.add_argument('--workers', type=int, default=0, help='processes to scan with (0 = one per CPU)')
+    args = parser.parse_args()
+
+    paths = args.paths or data_files()
+    workers = min(args.workers or cpu_count(), len(paths))
+    jobs = [(path, args.fix) for path in paths]
+    started = time.perf_counter()
+    if workers > 1:
+        with Pool(workers) as pool:
+            results = pool.map(_scan_file, jobs)
+    else:
+        results = list(map(_scan_file, jobs))
+
+    remaining = 0
+    for path, findings, fixed, elapsed in results:
+        for finding in findings:
+            print(finding)
+        remaining += len(findings) - fixed
+        summary = f"{path}: {len(findings)} findings in {elapsed:.1f} ms"
+        print(summary + (f", {fixed} fixed" if fixed else ""))
+    print(f"Scanned {len(results)} files in {(time.perf_counter() - started) * 1000:.0f} ms")
+    if remaining:
+        sys.exit(1)
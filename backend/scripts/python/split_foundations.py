@@ -0,0 +1,203 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+from problem_store import atomic_write
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Splits the foundations content into per-module chunks for the frontend.
+#
+# foundations.json (categories > modules) and mastery_drills.json (pattern
+# key > drills) are each shipped as one document, although a module view
+# needs a single entry. Every module and every drill set is written to its
+# own file named after a hash of its content, next to a gzip variant and,
+# with --brotli (which needs the brotli package), a brotli one. Variants are
+# never picked from what happens to be installed, so --check gives the same
+# answer on every machine. A small manifest per
+# source lists what is there, so first load fetches only the manifest and a
+# module view fetches only its own chunk.
+#
+# Chunk names change whenever their content does, so they can be cached
+# forever (see frontend/public/_headers); the manifests keep stable names.
+# On a rebuild, chunks whose file already exists are skipped, and chunks no
+# manifest refers to any more are deleted. --check writes nothing and exits
+# with status 1 when frontend/public/data is not what a build would leave;
+# the frontend build runs it (npm run check:data) so an edited
+# foundations.json cannot ship with stale chunks.
+
+FOUNDATIONS_PATH = 'frontend/src/data/foundations.json'
+DRILLS_PATH = 'frontend/src/data/mastery_drills.json'
+OUT_DIR = 'frontend/public/data'
+MANIFEST_VERSION = 1
+MODULE_FIELDS = ('id', 'title', 'family', 'difficulty', 'description')
+CATEGORY_FIELDS = ('id', 'title', 'description', 'icon')
+# Precompressed variant suffix -> its size field in the manifest
+SUFFIXES = {'.gz': 'gzipSize', '.br': 'brotliSize'}
+
+
+def encode(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def compress(suffix, data):
+    if suffix == '.gz':
+        # mtime=0 keeps the gzip bytes a function of the content alone
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+def suffixes(with_brotli=False):
+    """Precompressed variants a build writes."""
+    return ['.gz'] + (['.br'] if with_brotli else [])
+
+
+class ChunkWriter:
+    """Writes content-addressed chunks under `out_dir`, skipping ones already there."""
+
+    def __init__(self, out_dir, dry_run=False, with_brotli=False):
+        self.out_dir = out_dir
+        self.dry_run = dry_run
+        self.suffixes = suffixes(with_brotli)
+        self.written = []
+        self.skipped = 0
+        self.live = set()
+
+    def write(self, group, name, value):
+        data = encode(value)
+        digest = content_hash(data)
+        chunk = f'{group}/{name}.{digest}.json'
+        entry = {'chunk': chunk, 'hash': digest, 'size': len(data)}
+        path = os.path.join(self.out_dir, chunk)
+        paths = [path] + [path + suffix for suffix in self.suffixes]
+        self.live.update(os.path.normpath(p) for p in paths)
+        if all(os.path.exists(p) for p in paths):
+            self.skipped += 1
+            for suffix in self.suffixes:
+                entry[SUFFIXES[suffix]] = os.path.getsize(path + suffix)
+            return entry
+        if not self.dry_run:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with atomic_write(path, binary=True) as f:
+                f.write(data)
+        for suffix in self.suffixes:
+            packed = compress(suffix, data)
+            if not self.dry_run:
+                with atomic_write(path + suffix, binary=True) as f:
+                    f.write(packed)
+            entry[SUFFIXES[suffix]] = len(packed)
+        self.written.append(chunk)
+        return entry
+
+    def prune(self, groups):
+        """Delete chunk files in `groups` that this build did not produce."""
+        removed = []
+        for group in groups:
+            directory = os.path.join(self.out_dir, group)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                path = os.path.normpath(os.path.join(directory, name))
+                if path not in self.live:
+                    if not self.dry_run:
+                        os.remove(path)
+                    removed.append(path)
+        return removed
+
+
+def write_manifest(path, manifest, dry_run=False):
+    """Write `manifest` unless the file already holds exactly it; True if it differed."""
+    data = json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8') + b'\n'
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    if not dry_run:
+        with atomic_write(path, binary=True) as f:
+            f.write(data)
+    return True
+
+
+def split_foundations(categories, writer):
+    manifest = []
+    for category in categories:
+        entry = {k: category[k] for k in CATEGORY_FIELDS if k in category}
+        entry['modules'] = []
+        for module in category.get('modules', []):
+            item = {k: module[k] for k in MODULE_FIELDS if k in module}
+            item.update(writer.write('foundations', module['id'], module))
+            entry['modules'].append(item)
+        manifest.append(entry)
+    return {'version': MANIFEST_VERSION, 'categories': manifest}
+
+
+def split_drills(drills, writer):
+    patterns = []
+    for key, items in drills.items():
+        entry = {'id': key, 'count': len(items)}
+        entry.update(writer.write('mastery_drills', key, items))
+        patterns.append(entry)
+    return {'version': MANIFEST_VERSION, 'patterns': patterns}
+
+
+def build(foundations_path=FOUNDATIONS_PATH, drills_path=DRILLS_PATH, out_dir=OUT_DIR, dry_run=False,
+          with_brotli=False):
+    """Split both sources into `out_dir`; returns (ChunkWriter, manifests changed, paths pruned).
+
+    With dry_run nothing is written or removed; the results say what a
+    build would do.
+    """
+    with open(foundations_path, 'r', encoding='utf-8') as f:
+        categories = json.load(f)
+    with open(drills_path, 'r', encoding='utf-8') as f:
+        drills = json.load(f)
+
+    if not dry_run:
+        os.makedirs(out_dir, exist_ok=True)
+    writer = ChunkWriter(out_dir, dry_run, with_brotli)
+    manifests = {
+        'foundations.manifest.json': split_foundations(categories, writer),
+        'mastery_drills.manifest.json': split_drills(drills, writer),
+    }
+    changed = [name for name, manifest in manifests.items()
+               if write_manifest(os.path.join(out_dir, name), manifest, dry_run)]
+    return writer, changed, writer.prune(['foundations', 'mastery_drills'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Split foundations.json and mastery_drills.json into content-hashed chunks.')
+    parser.add_argument('--foundations', default=FOUNDATIONS_PATH)
+    parser.add_argument('--drills', default=DRILLS_PATH)
+    parser.add_argument('--out', default=OUT_DIR)
+    parser.add_argument('--check', action='store_true', help='only report whether the chunks are up to date')
+    parser.add_argument('--brotli', action='store_true', help='also write (or expect) .br variants')
+    args = parser.parse_args()
+
+    if args.brotli and brotli is None:
+        parser.error("--brotli needs the brotli package")
+    writer, changed, removed = build(args.foundations, args.drills, args.out, dry_run=args.check,
+                                     with_brotli=args.brotli)
+    if args.check:
+        stale = writer.written + changed + removed
+        for path in stale:
+            print(f"  out of date: {path}")
+        if stale:
+            print(f"{args.out} is out of date; run split_foundations.py")
+            sys.exit(1)
+        print(f"{args.out} is up to date")
+    else:
+        for name in changed:
+            print(f"Wrote {name}")
+        print(f"{len(writer.written)} chunks written, {writer.skipped} unchanged, {len(removed)} stale files removed")
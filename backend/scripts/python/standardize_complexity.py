@@ -1,8 +1,8 @@
-import json
+import argparse
 
-path = r'c:\Users\Jaswanth Reddy\OneDrive\Desktop\Projects\Algoscope\frontend\src\data\problems.json'
-with open(path, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+from pipeline_cache import Stage, run_stage
+
+PROBLEMS_PATH = 'backend/data/problems.json'
 
 # IDs to standardize
 standardize_ids = [11, 20, 33, 48, 49, 53, 55, 56, 70, 74]
@@ -21,9 +21,21 @@ schema_overrides = {
     74: {"brute": {"time": "O(N*M)", "space": "O(1)"}, "optimal": {"time": "O(log(N*M))", "space": "O(1)"}},
 }
 
-for problem in data:
-    if problem['id'] in schema_overrides:
-        problem['complexity'] = schema_overrides[problem['id']]
 
-with open(path, 'w', encoding='utf-8') as f:
-    json.dump(data, f, indent=2, ensure_ascii=True)
+def apply_override(problem):
+    problem['complexity'] = schema_overrides[problem['id']]
+    return problem
+
+
+# Only the overridden ids go through the transform; with a sharded corpus
+# only their shards are read and rewritten
+STAGE = Stage('complexity_overrides', apply_override, (schema_overrides,), ids=list(schema_overrides))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply the hand-written complexity overrides.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('--force', action='store_true', help='ignore the content-hash cache')
+    args = parser.parse_args()
+
+    print(run_stage(args.path, STAGE, force=args.force))
@@ -0,0 +1,344 @@
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from problem_store import atomic_write
+
+# Step traces for the visualizer at sizes the browser generators cannot reach.
+#
+# The tracers mirror frontend/src/utils/algoGenerators.ts and produce the
+# same Step objects, but keep the per-step state in NumPy arrays computed in
+# bulk, so tracing a million elements costs a handful of array passes. Step
+# dicts are only built for the frames actually emitted, after decimation to
+# a target frame count.
+#
+# The NDJSON stream is bounded in memory on both ends:
+#   {"type": "header", ...}                    algorithmType, steps, frames
+#   {"type": "base", "key", "offset", "values"} constant state (the input
+#                                               array), in chunks
+#   {"type": "keyframe", "step", "description", "state"}
+#   {"type": "delta", "step", "description", "set", "unset"?}
+#   {"type": "end"}
+# A frame's full state is the base merged with the last keyframe and every
+# delta since. Keyframes repeat every KEYFRAME_INTERVAL frames so a client
+# can start rendering, or seek, without replaying the whole stream.
+
+FRAME_TARGET = 2000
+KEYFRAME_INTERVAL = 256
+ARRAY_CHUNK = 65536
+FLUSH_LINES = 64
+# Above this the highlight list is dropped; windowRange still carries it
+HIGHLIGHT_LIMIT = 1000
+
+
+def _num(value):
+    """A NumPy scalar as the int or float JSON would show."""
+    value = value.item() if hasattr(value, 'item') else value
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+class Trace:
+    """Per-step state of one run: `frame(i)` builds Step i on demand."""
+
+    __slots__ = ('base', 'count', 'frame', 'events')
+
+    def __init__(self, base, count, frame, events=None):
+        self.base = base
+        self.count = count
+        self.frame = frame
+        # Steps decimation should prefer keeping (a new maximum, a match)
+        self.events = events
+
+
+def trace_binary_search(nums, target=None):
+    nums = np.asarray(nums)
+    if target is None:
+        target = nums[len(nums) // 2] if len(nums) else 0
+    target = _num(target)
+    # O(log N) iterations, so the loop itself stays in Python
+    lefts, rights, mids = [], [], []
+    left, right, found = 0, len(nums) - 1, False
+    while left <= right:
+        mid = (left + right) // 2
+        lefts.append(left)
+        rights.append(right)
+        mids.append(mid)
+        if nums[mid] == target:
+            found = True
+            break
+        if nums[mid] < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+    count = 1 + len(mids) + (0 if found else 1)
+
+    def frame(i):
+        if i == 0:
+            return {'step': 0, 'description': f"Starting Binary Search for {target}. Range: [0, {len(nums) - 1}]",
+                    'state': {'pointers': {'left': 0, 'right': len(nums) - 1}, 'phase': 'init'}}
+        if i > len(mids):
+            return {'step': i, 'description': f"Target {target} not found in array.",
+                    'state': {'phase': 'not_found'}}
+        left, right, mid = lefts[i - 1], rights[i - 1], mids[i - 1]
+        val = _num(nums[mid])
+        is_match = val == target
+        if is_match:
+            explanation = f"Found target {target} at index {mid}!"
+        elif val < target:
+            explanation = f"{val} < {target}, searching right half."
+        else:
+            explanation = f"{val} > {target}, searching left half."
+        return {'step': i, 'description': f"Checking middle element at index {mid} ({val})",
+                'state': {'pointers': {'left': left, 'right': right, 'mid': mid}, 'explanation': explanation,
+                          'phase': 'found' if is_match else 'searching', 'highlightIndices': [mid]}}
+
+    events = np.zeros(count, dtype=bool)
+    events[len(mids)] = found
+    return Trace({'array': nums}, count, frame, events)
+
+
+def trace_maximum_subarray_kadane(nums, target=None):
+    nums = np.asarray(nums)
+    n = len(nums)
+    if n == 0:
+        return Trace({'array': nums}, 0, None)
+    idx = np.arange(n)
+    # currentMax[i] is the best sum ending at i: the prefix sum minus the
+    # smallest earlier prefix (the empty prefix counts as 0)
+    prefix = np.cumsum(nums)
+    earlier = np.concatenate(([0], prefix[:-1]))
+    current = prefix - np.minimum.accumulate(np.minimum(earlier, 0))
+    best = np.maximum.accumulate(current)
+    # The loop restarts the window at i when the running sum before it was negative
+    restart = np.zeros(n, dtype=bool)
+    restart[1:] = current[:-1] < 0
+    temp_start = np.maximum.accumulate(np.where(restart, idx, 0))
+    new_max = np.ones(n, dtype=bool)
+    new_max[1:] = current[1:] > best[:-1]
+    end = np.maximum.accumulate(np.where(new_max, idx, 0))
+    start = temp_start[end]
+
+    def frame(i):
+        current_max, max_so_far = _num(current[i]), _num(best[i])
+        lo, hi = int(start[i]), int(end[i])
+        state = {'pointers': {'i': i}, 'windowRange': [lo, hi],
+                 'customState': {'currentMax': current_max, 'maxSoFar': max_so_far},
+                 'explanation': f"Current Sum: {current_max}, Global Max: {max_so_far}"}
+        if hi - lo < HIGHLIGHT_LIMIT:
+            state['highlightIndices'] = list(range(lo, hi + 1))
+        return {'step': i, 'description': f"Element {_num(nums[i])} at index {i}. Max so far: {max_so_far}",
+                'state': state}
+
+    return Trace({'array': nums}, n, frame, new_max)
+
+
+def container_walk(heights):
+    """The (l, r) pairs the two-pointer loop visits, without running the loop.
+
+    The loop always moves the pointer at the shorter line (the right one on
+    a tie). A line is therefore passed once the tallest line on its own side
+    so far is shorter than the tallest on the other side so far, which makes
+    the move order a merge of the two running maxima, done with
+    searchsorted.
+    """
+    n = len(heights)
+    moves = max(n - 1, 0)
+    from_left = np.maximum.accumulate(heights)
+    from_right = np.maximum.accumulate(heights[::-1])
+    # Left move i comes after every right move whose running max is <= its own
+    left_at = np.arange(n) + np.searchsorted(from_right, from_left, side='right')
+    is_left = np.zeros(moves, dtype=bool)
+    is_left[left_at[left_at < moves]] = True
+    l = np.concatenate(([0], np.cumsum(is_left)))[:moves]
+    r = (n - 1) - np.concatenate(([0], np.cumsum(~is_left)))[:moves]
+    return l, r
+
+
+def trace_container_with_most_water(heights, target=None):
+    heights = np.asarray(heights)
+    l, r = container_walk(heights)
+    hl, hr = heights[l], heights[r]
+    width = r - l
+    h = np.minimum(hl, hr)
+    area = width * h
+    best = np.maximum.accumulate(np.concatenate(([0], area)))
+    new_max = area > best[:-1]
+    max_area = best[1:]
+    moves = len(l)
+    final = _num(best[-1])
+
+    def frame(i):
+        if i == 0:
+            return {'step': 0, 'description': "Initialize pointers at both ends of the heights array.",
+                    'state': {'pointers': {'l': 0, 'r': len(heights) - 1},
+                              'customState': {'maxArea': 0, 'currentArea': 0},
+                              'explanation': "The area is limited by the shorter line and the distance between them. "
+                                             "Starting with maximum width.",
+                              'phase': 'init'}}
+        if i > moves:
+            return {'step': i, 'description': f"Max area found: {final}",
+                    'state': {'customState': {'maxArea': final}, 'finalAnswer': final,
+                              'explanation': "The maximum volume of water that can be contained between any two "
+                                             f"vertical lines is {final}.",
+                              'phase': 'found'}}
+        k = i - 1
+        left, right = int(l[k]), int(r[k])
+        w, ht, a = int(width[k]), _num(h[k]), _num(area[k])
+        if new_max[k]:
+            explanation = f"Found NEW maximum area: {a}! ({w} width * {ht} height)"
+        else:
+            explanation = (f"Current area {a} is not greater than max {_num(max_area[k])}. "
+                           "Moving the pointer pointing to the shorter line.")
+        return {'step': i, 'description': f"L={left}, R={right}. Width={w}, Height={ht}. Area={a}.",
+                'state': {'pointers': {'l': left, 'r': right}, 'highlightIndices': [left, right],
+                          'customState': {'maxArea': _num(max_area[k]), 'currentArea': a, 'width': w, 'h': ht,
+                                          'hL': _num(hl[k]), 'hR': _num(hr[k])},
+                          'explanation': explanation, 'phase': 'searching'}}
+
+    events = np.concatenate(([False], new_max, [True]))
+    return Trace({'array': heights}, moves + 2, frame, events)
+
+
+class Tracer:
+    __slots__ = ('name', 'trace', 'sample')
+
+    def __init__(self, name, trace, sample):
+        self.name = name
+        self.trace = trace
+        # sample(n, rng) -> (nums, target) for a synthetic input of size n
+        self.sample = sample
+
+
+BINARY_SEARCH = Tracer('binary-search', trace_binary_search,
+                       lambda n, rng: (np.sort(rng.integers(0, 4 * n, n)), None))
+KADANE = Tracer('maximum-subarray', trace_maximum_subarray_kadane,
+                lambda n, rng: (rng.integers(-1000, 1000, n), None))
+CONTAINER = Tracer('container-with-most-water', trace_container_with_most_water,
+                   lambda n, rng: (rng.integers(0, 10000, n), None))
+
+# algorithmType -> slug -> tracer; the None entry is the default for the type
+TRACERS = {
+    'binary_search': {None: BINARY_SEARCH, BINARY_SEARCH.name: BINARY_SEARCH},
+    'two_pointer': {None: CONTAINER, CONTAINER.name: CONTAINER, KADANE.name: KADANE},
+}
+# Both spellings occur in problems.json
+TRACERS['two_pointers'] = TRACERS['two_pointer']
+
+
+def tracer_for(algorithm_type, slug=None):
+    by_slug = TRACERS.get(algorithm_type)
+    if by_slug is None:
+        raise KeyError(f"No tracer for algorithmType '{algorithm_type}'")
+    return by_slug.get(slug, by_slug[None])
+
+
+def decimate(count, target, events=None):
+    """Indices of at most `target` of `count` steps: evenly spaced, plus events.
+
+    The first and last steps are always kept. Events take up to half of the
+    budget and are thinned evenly when there are more.
+    """
+    if target is None or count <= target:
+        return np.arange(count)
+    hits = np.flatnonzero(events) if events is not None else np.empty(0, dtype=np.int64)
+    budget = target // 2
+    if len(hits) > budget:
+        hits = hits[np.linspace(0, len(hits) - 1, budget).round().astype(np.int64)]
+    even = np.linspace(0, count - 1, max(target - len(hits), 2)).round().astype(np.int64)
+    return np.union1d(even, hits)
+
+
+def iter_records(trace, algorithm_type, tracer_name, frame_target=FRAME_TARGET,
+                 keyframe_interval=KEYFRAME_INTERVAL, chunk=ARRAY_CHUNK):
+    """Yield the NDJSON records of `trace`, one dict per line."""
+    indices = decimate(trace.count, frame_target, trace.events)
+    yield {'type': 'header', 'algorithmType': algorithm_type, 'tracer': tracer_name,
+           'steps': trace.count, 'frames': len(indices), 'keyframeInterval': keyframe_interval}
+    for key, values in trace.base.items():
+        # An empty input still gets one (empty) chunk, as the JS generators
+        # always carry the array
+        for offset in range(0, max(len(values), 1), chunk):
+            yield {'type': 'base', 'key': key, 'offset': offset, 'values': values[offset:offset + chunk].tolist()}
+
+    previous = None
+    for k, i in enumerate(indices):
+        step = trace.frame(int(i))
+        state = step['state']
+        if k % keyframe_interval == 0:
+            yield {'type': 'keyframe', **step}
+        else:
+            record = {'type': 'delta', 'step': step['step'], 'description': step['description'],
+                      'set': {key: value for key, value in state.items() if previous.get(key) != value}}
+            unset = [key for key in previous if key not in state]
+            if unset:
+                record['unset'] = unset
+            yield record
+        previous = state
+    yield {'type': 'end'}
+
+
+def replay(records):
+    """Rebuild full Step dicts from NDJSON records, as a client would."""
+    base = {}
+    state = {}
+    for record in records:
+        kind = record['type']
+        if kind == 'base':
+            base.setdefault(record['key'], []).extend(record['values'])
+        elif kind in ('keyframe', 'delta'):
+            if kind == 'keyframe':
+                state = dict(record['state'])
+            else:
+                state.update(record['set'])
+                for key in record.get('unset', ()):
+                    state.pop(key, None)
+            yield {'step': record['step'], 'description': record['description'], 'state': {**base, **state}}
+
+
+def write_ndjson(records, out):
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, separators=(',', ':')))
+        if len(lines) >= FLUSH_LINES:
+            out.write('\n'.join(lines) + '\n')
+            out.flush()
+            lines = []
+    if lines:
+        out.write('\n'.join(lines) + '\n')
+    out.flush()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stream a decimated Step trace as NDJSON.')
+    parser.add_argument('algorithm_type', help='algorithmType, e.g. binary_search or two_pointer')
+    parser.add_argument('--slug', help='pick the tracer for one problem, e.g. maximum-subarray')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input', help='JSON array to trace')
+    source.add_argument('--size', type=int, help='trace a random input of this many elements')
+    parser.add_argument('--target', type=float)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--frames', type=int, default=FRAME_TARGET, help='target frame count (0 = every step)')
+    parser.add_argument('--keyframe-interval', type=int, default=KEYFRAME_INTERVAL)
+    parser.add_argument('-o', '--output', help='write to a file instead of stdout')
+    args = parser.parse_args()
+
+    try:
+        tracer = tracer_for(args.algorithm_type, args.slug)
+    except KeyError as e:
+        parser.error(e.args[0])
+    if args.input is not None:
+        nums, target = np.asarray(json.loads(args.input)), None
+    else:
+        nums, target = tracer.sample(args.size, np.random.default_rng(args.seed))
+    if args.target is not None:
+        target = args.target
+
+    trace = tracer.trace(nums, target)
+    records = iter_records(trace, args.algorithm_type, tracer.name, args.frames or None, args.keyframe_interval)
+    if args.output:
+        with atomic_write(args.output) as f:
+            write_ndjson(records, f)
+    else:
+        write_ndjson(records, sys.stdout)
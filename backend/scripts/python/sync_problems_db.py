@@ -0,0 +1,162 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from problem_store import iter_problems
+
+# Bulk counterpart of backend/sync_json_to_db.js for the SQLite dev database.
+#
+# Rows are built exactly as the Prisma sync builds them (meta-file merge,
+# objects stringified, *_efficiency preferred over *_complexity), narrowed
+# to the columns the table actually has. Each row is serialized once and
+# hashed, and compared with a hash of the same columns as stored, so only
+# new or changed slugs are written: one executemany UPDATE and one
+# executemany INSERT inside a single transaction. A sync with nothing to
+# change never opens a write transaction.
+
+PROBLEMS_PATH = 'frontend/src/data/problems.json'
+DB_PATH = 'database/prisma/dev.db'
+META_GLOB = 'backend/*_meta.json'
+TABLE = 'Problem'
+
+# Prisma model fields in sync_json_to_db.js order; acceptanceRate is skipped there too
+FIELDS = [
+    'title', 'slug', 'difficulty', 'algorithmType', 'status', 'tags', 'primaryPattern',
+    'shortPatternReason', 'time_complexity', 'space_complexity', 'problem_statement',
+    'labConfig', 'constraints', 'edgeCases', 'examples', 'thinking_guide', 'complexity',
+    'brute_force_explanation', 'brute_force_steps', 'optimal_explanation', 'optimal_steps',
+    'optimal_variants', 'structuredExamples', 'companyTags', 'codeSnippets', 'patternSignals',
+    'secondaryPatterns',
+]
+
+
+def ensure_string(value):
+    """The Prisma sync's ensureString: None stays NULL, strings pass, the rest is JSON."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_meta(pattern=META_GLOB):
+    lookup = {}
+    for name in sorted(glob.glob(pattern)):
+        try:
+            with open(name, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not parse meta file {name}: {e}", file=sys.stderr)
+            continue
+        if meta.get('slug'):
+            lookup[meta['slug']] = meta
+            lookup[meta['slug'].replace('-', '_')] = meta
+        if meta.get('id'):
+            lookup[str(meta['id'])] = meta
+    return lookup
+
+
+def find_meta(lookup, p):
+    slug = p.get('slug') or ''
+    for key in (slug, str(p.get('id')), slug.replace('-', '_'), slug.split('-')[0]):
+        if key in lookup:
+            return lookup[key]
+    return {}
+
+
+def build_row(p, meta):
+    problem = {**p, **meta}
+    row = {field: problem.get(field) for field in FIELDS}
+    # `||` in the JS: an empty string falls through as well
+    row['time_complexity'] = problem.get('time_efficiency') or problem.get('time_complexity')
+    row['space_complexity'] = problem.get('space_efficiency') or problem.get('space_complexity')
+    return {field: ensure_string(value) for field, value in row.items()}
+
+
+def row_hash(values):
+    text = json.dumps(values, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def table_columns(conn, table=TABLE):
+    """Column names, and the NOT NULL ones without a default."""
+    info = conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+    if not info:
+        raise sqlite3.OperationalError(f"no table {table!r} in the database")
+    # (cid, name, type, notnull, default, pk)
+    return [row[1] for row in info], [row[1] for row in info if row[3] and row[4] is None and not row[5]]
+
+
+def stored_hashes(conn, columns, table=TABLE):
+    quoted = ', '.join(f'"{c}"' for c in columns)
+    return {row[0]: row_hash(list(row[1:]))
+            for row in conn.execute(f'SELECT "slug", {quoted} FROM "{table}"')}
+
+
+def plan_sync(problems, columns, stored, meta=None, required=()):
+    """Split the corpus into inserts, updates, the unchanged count and rejected rows."""
+    meta = meta or {}
+    rows = {}
+    rejected = []
+    for p in problems:
+        row = build_row(p, find_meta(meta, p))
+        empty = [c for c in required if row.get(c) is None]
+        if empty:
+            # One NULL would abort the whole batch; the Prisma sync skipped just the row
+            rejected.append((p.get('id'), p.get('slug'), f"missing {', '.join(empty)}"))
+            continue
+        # A repeated slug overwrites the earlier record, as the per-row upserts did
+        rows[row['slug']] = [row[c] for c in columns]
+    inserts, updates = [], []
+    for slug, values in rows.items():
+        if slug not in stored:
+            inserts.append(values)
+        elif stored[slug] != row_hash(values):
+            updates.append(values + [slug])
+    return inserts, updates, len(rows) - len(inserts) - len(updates), rejected
+
+
+def sync(path=PROBLEMS_PATH, db_path=DB_PATH, meta_glob=META_GLOB, dry_run=False):
+    conn = sqlite3.connect(db_path)
+    try:
+        present, required = table_columns(conn)
+        columns = [f for f in FIELDS if f in present]
+        missing = [f for f in FIELDS if f not in present]
+        stored = stored_hashes(conn, columns)
+        inserts, updates, unchanged, rejected = plan_sync(
+            iter_problems(path), columns, stored, load_meta(meta_glob), required)
+        if (inserts or updates) and not dry_run:
+            quoted = ', '.join(f'"{c}"' for c in columns)
+            assignments = ', '.join(f'"{c}" = ?' for c in columns)
+            with conn:
+                conn.executemany(f'UPDATE "{TABLE}" SET {assignments} WHERE "slug" = ?', updates)
+                conn.executemany(f'INSERT INTO "{TABLE}" ({quoted}) VALUES ({", ".join("?" * len(columns))})',
+                                 inserts)
+        return {'inserted': len(inserts), 'updated': len(updates), 'unchanged': unchanged,
+                'rejected': rejected, 'missing_columns': missing}
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sync problems.json into the Problem table, writing only changed rows.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--meta', default=META_GLOB, help='glob of *_meta.json files merged over matching problems')
+    parser.add_argument('--dry-run', action='store_true', help='report what would change without writing')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"Database not found at {args.db}")
+    started = time.perf_counter()
+    result = sync(args.path, args.db, args.meta, args.dry_run)
+    if result['missing_columns']:
+        print(f"Skipping fields the table does not have: {', '.join(result['missing_columns'])}")
+    for pid, slug, reason in result['rejected']:
+        print(f"Skipped problem {pid} ({slug}): {reason}")
+    verb = 'Would write' if args.dry_run else 'Wrote'
+    print(f"{verb} {result['inserted']} new and {result['updated']} changed problems, "
+          f"{result['unchanged']} unchanged ({time.perf_counter() - started:.2f} s)")
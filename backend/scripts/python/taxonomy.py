@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+
+from problem_store import atomic_write
+
+# Compiled view of frontend/src/data/patternHierarchy.ts.
+#
+# The TS file is the single source of truth for patternLevel /
+# primaryPattern / subPattern. It is parsed once and the result is cached on
+# disk. Like the problem_index.py sidecar the cache is keyed by the source's
+# size and mtime, so a warm load is one stat; the source is hashed only when
+# those move, and reparsed only when the hash does too. Lookups go through
+# frozensets.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HIERARCHY_SOURCE = os.path.join(SCRIPT_DIR, '..', '..', '..', 'frontend', 'src', 'data', 'patternHierarchy.ts')
+CACHE_DIR = os.path.join(SCRIPT_DIR, '.cache')
+CACHE_PATH = os.path.join(CACHE_DIR, 'taxonomy_index.json')
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[A-Za-z_$][\w$]*(?=\s*:)')
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+_LINE_COMMENT = re.compile(r'^\s*//.*$', re.M)
+
+
+def _literal_to_json(literal):
+    def quote(match):
+        token = match.group(0)
+        if token[0] == '"':
+            return token
+        if token[0] == "'":
+            return json.dumps(token[1:-1])
+        return f'"{token}"'
+
+    text = _LINE_COMMENT.sub('', literal)
+    text = _TOKEN.sub(quote, text)
+    return _TRAILING_COMMA.sub(r'\1', text)
+
+
+def parse_hierarchy(source):
+    """Extract {level: {primary: [subPatterns]}} from patternHierarchy.ts."""
+    start = source.index('PATTERN_HIERARCHY')
+    start = source.index('= {', start) + 2
+    depth = 0
+    for end in range(start, len(source)):
+        if source[end] == '{':
+            depth += 1
+        elif source[end] == '}':
+            depth -= 1
+            if depth == 0:
+                break
+    groups = json.loads(_literal_to_json(source[start:end + 1]))
+    return {
+        level: {primary: list(pattern['subPatterns']) for primary, pattern in group['patterns'].items()}
+        for level, group in groups.items()
+    }
+
+
+class TaxonomyIndex:
+    __slots__ = ('hierarchy', 'levels', 'patterns', 'sub_patterns', 'level_of')
+
+    def __init__(self, hierarchy):
+        # `hierarchy` keeps source order so "first valid entry" fallbacks
+        # stay deterministic; everything else is a frozenset or dict lookup.
+        self.hierarchy = hierarchy
+        self.levels = frozenset(hierarchy)
+        self.patterns = {level: frozenset(prims) for level, prims in hierarchy.items()}
+        self.sub_patterns = {
+            (level, primary): frozenset(subs)
+            for level, prims in hierarchy.items()
+            for primary, subs in prims.items()
+        }
+        self.level_of = {primary: level for level, prims in hierarchy.items() for primary in prims}
+
+    def first_pattern(self, level):
+        return next(iter(self.hierarchy[level]))
+
+    def first_sub_pattern(self, level, primary):
+        return self.hierarchy[level][primary][0]
+
+    def is_valid(self, level, primary, sub):
+        return sub in self.sub_patterns.get((level, primary), ())
+
+    def check(self, level, primary, sub):
+        """Return an error message for an invalid triple, or None."""
+        if not level or level not in self.levels:
+            return f"Invalid patternLevel '{level}'"
+        if not primary or primary not in self.patterns[level]:
+            return f"Invalid primaryPattern '{primary}' for level '{level}'"
+        if not sub or sub not in self.sub_patterns[(level, primary)]:
+            return f"Invalid subPattern '{sub}' for pattern '{primary}'"
+        return None
+
+
+def _write_cache(cache_path, stamp, digest, hierarchy):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with atomic_write(cache_path) as f:
+        json.dump({'source_stamp': stamp, 'source_hash': digest, 'hierarchy': hierarchy}, f, indent=2)
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(source_path=HIERARCHY_SOURCE, cache_path=CACHE_PATH):
+    st = os.stat(source_path)
+    stamp = [st.st_size, st.st_mtime_ns]
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if not isinstance(cached, dict):
+            cached = {}
+    except (OSError, ValueError):
+        cached = {}
+    if cached.get('source_stamp') == stamp and 'hierarchy' in cached:
+        return TaxonomyIndex(cached['hierarchy'])
+
+    with open(source_path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached.get('source_hash') == digest and 'hierarchy' in cached:
+        # Touched but not edited: restamp the cache, no reparse
+        hierarchy = cached['hierarchy']
+    else:
+        hierarchy = parse_hierarchy(raw.decode('utf-8'))
+    _write_cache(cache_path, stamp, digest, hierarchy)
+    return TaxonomyIndex(hierarchy)
+
+
+if __name__ == '__main__':
+    index = load_taxonomy()
+    subs = sum(len(s) for s in index.sub_patterns.values())
+    print(f"Taxonomy: {len(index.levels)} levels, {len(index.level_of)} patterns, {subs} sub-patterns.")
@@ -0,0 +1,97 @@
+import pytest
+
+from complexity import ComplexityError, canonical, compare
+
+# parse -> canonical -> compare, on the spellings the corpus actually uses.
+# Run from backend/scripts/python: python -m pytest -q
+
+CANONICAL = [
+    ('O(1)', 'O(1)'),
+    ('O(n)', 'O(N)'),
+    ('O(n^2)', 'O(N²)'),
+    ('O(n²)', 'O(N²)'),
+    ('O(n * n)', 'O(N²)'),
+    ('O(n log n)', 'O(N log N)'),
+    ('O(log(n))', 'O(log N)'),
+    ('O(n^2 + n)', 'O(N²)'),
+    ('O(n + m)', 'O(M + N)'),
+    ('O(m*n)', 'O(M*N)'),
+    ('O(n * target)', 'O(N*target)'),
+    ('O(sqrt(n))', 'O(√N)'),
+    ('O(√n)', 'O(√N)'),
+    ('O(2^n)', 'O(2^N)'),
+    ('O(2ⁿ)', 'O(2^N)'),
+    ('O(n!)', 'O(N!)'),
+    ('O(n * n!)', 'O(N*N!)'),
+    ('O(4^n / sqrt(n))', 'O(4^N / √N)'),
+    ('O(min(m, n))', 'O(min(M, N))'),
+    ('O(log n) to O(n)', 'O(log N) to O(N)'),
+    ('O(n) amortized', 'O(N) amortized'),
+    ('O(n) - one pass', 'O(N) - one pass'),
+    # A subtracted term is dropped, leaving an upper bound
+    ('O(n - k)', 'O(N)'),
+    ('O(n - k + 1)', 'O(N)'),
+    ('O(2^(n-1))', 'O(2^N)'),
+    # Variable base with a variable exponent
+    ('O(k^n)', 'O(K^N)'),
+    ('O(n * k^n)', 'O(N*K^N)'),
+    ('O(log(k^n))', 'O(N log K)'),
+    # A constant factor in the exponent is folded into the base; only an
+    # additive constant is dropped
+    ('O(3^(2n))', 'O(9^N)'),
+    ('O(4^(n/2))', 'O(2^N)'),
+    ('O(2^(2n+1))', 'O(4^N)'),
+    ('O(2^(n+1))', 'O(2^N)'),
+    ('O(k^(2n))', 'O((K²)^N)'),
+    ('O(n^(1/2))', 'O(√N)'),
+    ('O(log^2 n)', 'O(log² N)'),
+]
+
+ORDER = [
+    # (a, b, sign of compare(a, b))
+    ('O(1)', 'O(log n)', -1),
+    ('O(log n)', 'O(sqrt(n))', -1),
+    ('O(sqrt(n))', 'O(n)', -1),
+    ('O(n)', 'O(n log n)', -1),
+    ('O(n log n)', 'O(n^2)', -1),
+    ('O(n^3)', 'O(2^n)', -1),
+    ('O(2^n)', 'O(3^n)', -1),
+    ('O(2^n)', 'O(2^(2n))', -1),
+    ('O(3^(2n))', 'O(8^n)', 1),
+    ('O(4^(n/2))', 'O(2^n)', 0),
+    ('O(3^n)', 'O(k^n)', -1),
+    ('O(2^n)', 'O(n!)', -1),
+    ('O(n)', 'O(N)', 0),
+    ('O(n + m)', 'O(n)', 0),
+    ('O(n - k)', 'O(n)', 0),
+    ('O(n^2)', 'O(n log n)', 1),
+]
+
+UNPARSEABLE = [
+    'n log n',
+    'O()',
+    'O(Product of Lengths)',
+    'O(Set-Bits)',
+    'O(n',
+    # 2^(n/2) is √2^n, which has no exact rendering
+    'O(2^(n/2))',
+]
+
+
+@pytest.mark.parametrize('text, expected', CANONICAL)
+def test_canonical(text, expected):
+    assert canonical(text) == expected
+    # The canonical form is a fixed point
+    assert canonical(expected) == expected
+
+
+@pytest.mark.parametrize('a, b, sign', ORDER)
+def test_compare(a, b, sign):
+    assert compare(a, b) == sign
+    assert compare(b, a) == -sign
+
+
+@pytest.mark.parametrize('text', UNPARSEABLE)
+def test_unparseable(text):
+    with pytest.raises(ComplexityError):
+        canonical(text)
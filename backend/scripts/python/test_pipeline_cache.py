@@ -0,0 +1,76 @@
+import importlib
+import sys
+
+import pytest
+
+import pipeline_cache
+from pipeline_cache import Stage, run_stage
+from problem_store import iter_problems, write_problems
+
+# A stage whose transform calls a helper from another module; editing the
+# helper alone must invalidate the cached output.
+
+TRANSFORM = '''
+from helpers import label
+
+
+def tag(p):
+    p['label'] = label(p)
+    return p
+'''
+
+
+def write_module(directory, name, source):
+    (directory / f'{name}.py').write_text(source, encoding='utf-8')
+    sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    return importlib.import_module(name)
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_cache, 'CACHE_DIR', str(tmp_path / '.cache'))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / 'problems.json'
+    write_problems(str(path), [{'id': 1, 'title': 'Two Sum'}, {'id': 2, 'title': 'Jump Game'}])
+    yield tmp_path, str(path)
+    for name in ('helpers', 'stages'):
+        sys.modules.pop(name, None)
+
+
+def labels(path):
+    return [p['label'] for p in iter_problems(path)]
+
+
+def stage(directory, helper):
+    helpers = write_module(directory, 'helpers', helper)
+    stages = write_module(directory, 'stages', TRANSFORM)
+    return Stage('label', stages.tag, deps=(helpers.label,))
+
+
+def test_unchanged_stage_is_skipped(corpus):
+    directory, path = corpus
+    helper = "def label(p):\n    return p['title'].lower()\n"
+    assert run_stage(path, stage(directory, helper)).rewritten == {1, 2}
+    assert not run_stage(path, stage(directory, helper)).checked
+
+
+def test_helper_change_reruns_stage(corpus):
+    directory, path = corpus
+    run_stage(path, stage(directory, "def label(p):\n    return p['title'].lower()\n"))
+    assert labels(path) == ['two sum', 'jump game']
+
+    result = run_stage(path, stage(directory, "def label(p):\n    return p['title'].upper()\n"))
+    assert result.rewritten == {1, 2}
+    assert labels(path) == ['TWO SUM', 'JUMP GAME']
+
+
+def test_module_change_reruns_stage(corpus):
+    directory, path = corpus
+    helpers = write_module(directory, 'helpers', "def label(p):\n    return p['title']\n")
+    stages = write_module(directory, 'stages', TRANSFORM)
+    run_stage(path, Stage('label', stages.tag, deps=(helpers.label,)))
+
+    # Only a function beside the transform changes, not the transform itself
+    stages = write_module(directory, 'stages', TRANSFORM + '\n\ndef unused():\n    return 1\n')
+    assert run_stage(path, Stage('label', stages.tag, deps=(helpers.label,))).checked == 2
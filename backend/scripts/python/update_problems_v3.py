@@ -1,78 +1,102 @@
-import json
-
-with open('backend/data/problems.json', 'r', encoding='utf-8') as f:
-    problems = json.load(f)
-
-# Valid Taxonomy
-VALID_HIERARCHY = {
-    "foundation": {
-        "array_basics": ["prefix_sum", "difference_array", "cyclic_sort", "in_place_rearrangement"],
-        "string_basics": ["character_frequency", "anagram_checking", "two_pointer_string"]
-    },
-    "core_patterns": {
-        "two_pointer": ["same_direction", "opposite_direction", "slow_fast_pointer", "partition_pattern", "cycle_detection"],
-        "sliding_window": ["fixed_window", "variable_window", "at_most_k", "exact_k", "longest_type", "minimum_type"],
-        "binary_search": ["classic", "lower_bound", "upper_bound", "search_on_answer", "predicate_binary_search", "rotated_array_search"]
-    },
-    "advanced_patterns": {
-        "graph_traversal": ["bfs_level_order", "dfs_backtracking", "topological_sort", "shortest_path_unweighted"],
-        "tree_patterns": ["postorder_accumulation", "path_sum", "diameter_calculation", "lca"]
-    }
-}
+import argparse
+
+from facet_index import update_facets
+from pipeline_cache import Stage, run_stage
+from taxonomy import load_taxonomy
+
+PROBLEMS_PATH = 'backend/data/problems.json'
+
+# Valid taxonomy, compiled from frontend/src/data/patternHierarchy.ts
+taxonomy = load_taxonomy()
 
 # Specific mappings for common problems
 SLUG_TO_METADATA = {
-    "two-sum": ("core_patterns", "two_pointer", "opposite_direction"),
-    "add-two-numbers": ("core_patterns", "two_pointer", "same_direction"),
+    "two-sum": ("core_patterns", "two_pointers", "opposite_direction"),
+    "add-two-numbers": ("core_patterns", "two_pointers", "same_direction"),
     "longest-substring-without-repeating-characters": ("core_patterns", "sliding_window", "variable_window"),
     "median-of-two-sorted-arrays": ("core_patterns", "binary_search", "classic"),
-    "longest-palindromic-substring": ("core_patterns", "two_pointer", "opposite_direction"),
-    "container-with-most-water": ("core_patterns", "two_pointer", "opposite_direction"),
-    "3sum": ("core_patterns", "two_pointer", "opposite_direction"),
-    "climbing-stairs": ("advanced_patterns", "tree_patterns", "postorder_accumulation"),
-    "merge-k-sorted-lists": ("core_patterns", "two_pointer", "same_direction"),
-    "reverse-nodes-in-k-group": ("core_patterns", "two_pointer", "same_direction"),
+    "longest-palindromic-substring": ("core_patterns", "two_pointers", "opposite_direction"),
+    "container-with-most-water": ("core_patterns", "two_pointers", "opposite_direction"),
+    "3sum": ("core_patterns", "two_pointers", "opposite_direction"),
+    "climbing-stairs": ("advanced_patterns", "dp_1d", "climbing_stairs_logic"),
+    "merge-k-sorted-lists": ("core_patterns", "two_pointers", "same_direction"),
+    "reverse-nodes-in-k-group": ("core_patterns", "two_pointers", "same_direction"),
     "search-in-rotated-sorted-array": ("core_patterns", "binary_search", "rotated_array_search"),
-    "trapping-rain-water": ("core_patterns", "two_pointer", "opposite_direction"),
-    "permutations": ("advanced_patterns", "graph_traversal", "dfs_backtracking"),
-    "subsets": ("advanced_patterns", "graph_traversal", "dfs_backtracking"),
-    "word-search": ("advanced_patterns", "graph_traversal", "dfs_backtracking"),
-    "binary-tree-level-order-traversal": ("advanced_patterns", "graph_traversal", "bfs_level_order"),
+    "trapping-rain-water": ("core_patterns", "two_pointers", "opposite_direction"),
+    "permutations": ("core_patterns", "backtracking", "permutations"),
+    "subsets": ("core_patterns", "backtracking", "subsets"),
+    "word-search": ("core_patterns", "backtracking", "state_space_tree"),
+    "binary-tree-level-order-traversal": ("core_patterns", "bfs", "level_order_traversal"),
 }
 
 TYPE_TO_LEVEL = {
     'two_pointer': 'core_patterns',
     'sliding_window': 'core_patterns',
     'binary_search': 'core_patterns',
-    'tree': 'advanced_patterns',
-    'graph': 'advanced_patterns',
-    'stack': 'foundation',
-    'linked_list': 'core_patterns',
-    'recursion': 'advanced_patterns'
+    'tree': 'core_patterns',
+    'graph': 'core_patterns',
+    'stack': 'data_structures',
+    'linked_list': 'data_structures',
+    'recursion': 'core_patterns'
 }
 
 TYPE_TO_PRIMARY = {
-    'two_pointer': 'two_pointer',
+    'two_pointer': 'two_pointers',
     'sliding_window': 'sliding_window',
     'binary_search': 'binary_search',
-    'tree': 'tree_patterns',
-    'graph': 'graph_traversal',
-    'stack': 'array_basics',
-    'linked_list': 'two_pointer',
-    'recursion': 'tree_patterns'
+    'tree': 'dfs',
+    'graph': 'bfs',
+    'stack': 'stacks',
+    'linked_list': 'linked_lists',
+    'recursion': 'recursion'
 }
 
 DEFAULT_SUB = {
-    'two_pointer': 'same_direction',
+    'two_pointers': 'same_direction',
     'sliding_window': 'variable_window',
     'binary_search': 'classic',
-    'tree_patterns': 'postorder_accumulation',
-    'graph_traversal': 'bfs_level_order',
-    'array_basics': 'prefix_sum',
-    'string_basics': 'character_frequency'
+    'dfs': 'preorder_inorder_postorder',
+    'bfs': 'level_order_traversal',
+    'stacks': 'lifo_principle',
+    'linked_lists': 'pointer_manipulation',
+    'recursion': 'recurrence_relation',
+    'arrays': 'traversal',
+    'strings': 'substrings'
 }
 
-for p in problems:
+
+def assign_from_type(p):
+    """Map algorithmType onto a valid level > primary > sub-pattern (shared with update_problems_v2)."""
+    old_type = p.get('algorithmType')
+    level = TYPE_TO_LEVEL.get(old_type, 'core_patterns')
+    primary = TYPE_TO_PRIMARY.get(old_type, 'sliding_window')
+
+    # Fallback for recursion/unmapped types
+    if level not in taxonomy.levels: level = 'core_patterns'
+    if primary not in taxonomy.patterns[level]:
+        # Find a valid primary for this level
+        primary = taxonomy.first_pattern(level)
+
+    p['patternLevel'] = level
+    p['primaryPattern'] = primary
+
+    # Ensure subPattern is valid for the primary
+    sub = p.get('subPattern')
+    if not sub or sub not in taxonomy.sub_patterns[(level, primary)]:
+        p['subPattern'] = DEFAULT_SUB.get(primary, taxonomy.first_sub_pattern(level, primary))
+    return p
+
+
+def assert_taxonomy(p):
+    # Raised rather than asserted so it also holds under python -O; a failure
+    # aborts before the temp file replaces problems.json
+    error = taxonomy.check(p['patternLevel'], p['primaryPattern'], p['subPattern'])
+    if error is not None:
+        raise ValueError(f"Problem {p.get('id')}: {error}")
+    return p
+
+
+def assign_taxonomy(p):
     slug = p.get('slug')
     
     if slug in SLUG_TO_METADATA:
@@ -81,31 +105,25 @@ for p in problems:
         p['primaryPattern'] = primary
         p['subPattern'] = sub
     else:
-        old_type = p.get('algorithmType')
-        level = TYPE_TO_LEVEL.get(old_type, 'core_patterns')
-        primary = TYPE_TO_PRIMARY.get(old_type, 'sliding_window')
-        
-        # Fallback for recursion/unmapped types
-        if level not in VALID_HIERARCHY: level = 'core_patterns'
-        if primary not in VALID_HIERARCHY[level]: 
-            # Find a valid primary for this level
-            primary = list(VALID_HIERARCHY[level].keys())[0]
-            
-        p['patternLevel'] = level
-        p['primaryPattern'] = primary
-        
-        # Ensure subPattern is valid for the primary
-        sub = p.get('subPattern')
-        if not sub or sub not in VALID_HIERARCHY[level][primary]:
-            p['subPattern'] = DEFAULT_SUB.get(primary, VALID_HIERARCHY[level][primary][0])
-
-# Final Validation Check within script
-for p in problems:
-    assert p['patternLevel'] in VALID_HIERARCHY
-    assert p['primaryPattern'] in VALID_HIERARCHY[p['patternLevel']]
-    assert p['subPattern'] in VALID_HIERARCHY[p['patternLevel']][p['primaryPattern']]
-
-with open('backend/data/problems.json', 'w', encoding='utf-8') as f:
-    json.dump(problems, f, indent=2)
-
-print("Problems updated and validated successfully.")
+        assign_from_type(p)
+
+    # Validate each record as it streams past
+    return assert_taxonomy(p)
+
+
+STAGE = Stage('taxonomy', assign_taxonomy,
+              (SLUG_TO_METADATA, TYPE_TO_LEVEL, TYPE_TO_PRIMARY, DEFAULT_SUB, taxonomy.hierarchy))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Assign and validate the pattern taxonomy for every problem.')
+    parser.add_argument('--force', action='store_true', help='ignore the content-hash cache')
+    args = parser.parse_args()
+
+    result = run_stage(PROBLEMS_PATH, STAGE, force=args.force)
+    print(result)
+    # Only the records the stage saw change can have new facets
+    changed = update_facets(PROBLEMS_PATH, ids=None if args.force else result.changed)
+    print(f"Facet index: {len(changed)} problems re-indexed")
+
+    print("Problems updated and validated successfully.")
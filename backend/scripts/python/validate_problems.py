@@ -0,0 +1,228 @@
+import argparse
+import sys
+
+from problem_store import iter_problems
+from taxonomy import load_taxonomy
+
+# Full-schema validation of the problems corpus.
+#
+# Every record is checked field by field in a single streaming pass. Errors
+# go into a bounded buffer (the first MAX_ERRORS are kept, the rest are only
+# counted), and --fail-fast stops at the first one. --near-duplicates also
+# flags problems whose text is nearly the same as an earlier problem's,
+# through the MinHash index in near_duplicates.py. The saved signatures are
+# only read; problems whose text changed are re-hashed in memory, and the
+# sidecar is kept up to date by generate_problems.py and near_duplicates.py.
+
+PROBLEMS_PATH = 'backend/data/problems.json'
+MAX_ERRORS = 50
+
+DIFFICULTIES = frozenset(('Easy', 'Medium', 'Hard'))
+THINKING_GUIDE_KEYS = frozenset(('first_principles', 'pattern_signals', 'naive_approach', 'approach_blueprint'))
+LAB_PARAM_TYPES = {'array': list, 'number': (int, float), 'string': str}
+STRING_LIST_FIELDS = ('tags', 'constraints', 'edgeCases', 'patternSignals', 'scenarios')
+STRING_FIELDS = ('time_complexity', 'space_complexity', 'time_efficiency', 'space_efficiency',
+                 'problem_statement', 'brute_force_explanation', 'optimal_explanation', 'intuition')
+
+
+class ValidationAborted(Exception):
+    pass
+
+
+class ErrorBuffer:
+    """Keeps the first `limit` errors and counts the rest."""
+
+    def __init__(self, limit=MAX_ERRORS, fail_fast=False):
+        self.limit = limit
+        self.fail_fast = fail_fast
+        self.errors = []
+        self.total = 0
+
+    def add(self, problem, message):
+        self.total += 1
+        if len(self.errors) < self.limit:
+            self.errors.append(f"Problem {problem.get('id')} ({problem.get('title')}): {message}")
+        if self.fail_fast:
+            raise ValidationAborted(self.errors[-1])
+
+    def __bool__(self):
+        return self.total > 0
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _is_big_o(value):
+    return isinstance(value, str) and value.startswith('O(')
+
+
+def _check_complexity(p, field, value, report):
+    # Three shapes are in use: {"time", "space"}, the legacy flat
+    # {"brute", "optimal", "space"} and {"brute": {...}, "optimal": {...}}.
+    if not isinstance(value, dict):
+        report.add(p, f"{field} must be an object")
+        return
+    if 'time' in value:
+        if not _is_big_o(value['time']):
+            report.add(p, f"{field}.time is not a Big-O string")
+        return
+    if 'optimal' not in value:
+        report.add(p, f"{field} has no optimal entry")
+    for key in ('brute', 'optimal'):
+        if key not in value:
+            continue
+        entry = value[key]
+        if isinstance(entry, dict):
+            if 'time' not in entry:
+                report.add(p, f"{field}.{key} has no time bound")
+            for part in ('time', 'space'):
+                if part in entry and not _is_big_o(entry[part]):
+                    report.add(p, f"{field}.{key}.{part} is not a Big-O string")
+        elif not _is_big_o(entry):
+            report.add(p, f"{field}.{key} is not a Big-O string")
+    if 'space' in value and not _is_big_o(value['space']):
+        report.add(p, f"{field}.space is not a Big-O string")
+
+
+def _check_examples(p, examples, report):
+    if not isinstance(examples, list):
+        report.add(p, "examples must be a list")
+        return
+    for i, ex in enumerate(examples):
+        if not isinstance(ex, dict):
+            report.add(p, f"examples[{i}] must be an object")
+        elif not isinstance(ex.get('input'), str) or not isinstance(ex.get('output'), str):
+            report.add(p, f"examples[{i}] needs string input and output")
+        elif 'explanation' in ex and not isinstance(ex['explanation'], str):
+            report.add(p, f"examples[{i}].explanation must be a string")
+
+
+def _check_steps(p, field, steps, report):
+    if not isinstance(steps, list):
+        report.add(p, f"{field} must be a list")
+        return
+    for i, step in enumerate(steps):
+        if not isinstance(step, dict) or 'step' not in step or not isinstance(step.get('description'), str):
+            report.add(p, f"{field}[{i}] needs step and description")
+
+
+def _check_thinking_guide(p, guide, report):
+    if not isinstance(guide, dict):
+        report.add(p, "thinking_guide must be an object")
+        return
+    for key, value in guide.items():
+        if key not in THINKING_GUIDE_KEYS:
+            report.add(p, f"thinking_guide has unknown section '{key}'")
+        elif not _is_str_list(value):
+            report.add(p, f"thinking_guide.{key} must be a list of strings")
+
+
+def _check_lab_config(p, config, report):
+    params = config.get('parameters') if isinstance(config, dict) else None
+    if not isinstance(params, list):
+        report.add(p, "labConfig.parameters must be a list")
+        return
+    for i, param in enumerate(params):
+        if not isinstance(param, dict) or not isinstance(param.get('name'), str):
+            report.add(p, f"labConfig.parameters[{i}] needs a name")
+            continue
+        expected = LAB_PARAM_TYPES.get(param.get('type'))
+        if expected is None:
+            report.add(p, f"labConfig.parameters[{i}] has unknown type '{param.get('type')}'")
+            continue
+        default = param.get('default', param.get('defaultValue'))
+        if default is not None and not isinstance(default, expected):
+            report.add(p, f"labConfig.parameters[{i}] default does not match type '{param['type']}'")
+
+
+def check_problem(p, taxonomy, report):
+    if not isinstance(p.get('id'), int):
+        report.add(p, "id must be an integer")
+    for field in ('title', 'slug'):
+        if not isinstance(p.get(field), str) or not p[field]:
+            report.add(p, f"{field} must be a non-empty string")
+    if p.get('difficulty') not in DIFFICULTIES:
+        report.add(p, f"Invalid difficulty '{p.get('difficulty')}'")
+
+    error = taxonomy.check(p.get('patternLevel'), p.get('primaryPattern'), p.get('subPattern'))
+    if error:
+        report.add(p, error)
+
+    for field in STRING_FIELDS:
+        if field in p and not isinstance(p[field], str):
+            report.add(p, f"{field} must be a string")
+    for field in STRING_LIST_FIELDS:
+        if field in p and not _is_str_list(p[field]):
+            report.add(p, f"{field} must be a list of strings")
+    for field in ('complexity', 'efficiency'):
+        if field in p:
+            _check_complexity(p, field, p[field], report)
+    for field in ('brute_force_steps', 'optimal_steps'):
+        if field in p:
+            _check_steps(p, field, p[field], report)
+    if 'examples' in p:
+        _check_examples(p, p['examples'], report)
+    if 'thinking_guide' in p:
+        _check_thinking_guide(p, p['thinking_guide'], report)
+    if 'labConfig' in p:
+        _check_lab_config(p, p['labConfig'], report)
+
+
+def _check_near_duplicates(p, index, seen, report):
+    pid = p.get('id')
+    if pid in seen:
+        return
+    index.add(p)
+    # Only earlier problems, so every pair is reported once
+    matches = [m for m in index.similar(pid) if m[0] in seen]
+    seen.add(pid)
+    if matches:
+        other, similarity = matches[0]
+        more = f" and {len(matches) - 1} more" if len(matches) > 1 else ''
+        report.add(p, f"near-duplicate of problem {other} ({similarity:.2f} similar){more}")
+
+
+def validate_corpus(path=PROBLEMS_PATH, limit=MAX_ERRORS, fail_fast=False, near_duplicates=None):
+    """Validate every problem at `path`; returns (problem count, ErrorBuffer).
+
+    `near_duplicates` is a similarity threshold (True for the default) above
+    which a problem is reported as a copy of an earlier one.
+    """
+    taxonomy = load_taxonomy()
+    report = ErrorBuffer(limit, fail_fast)
+    index = None
+    if near_duplicates:
+        from near_duplicates import THRESHOLD, NearDuplicateIndex
+        index = NearDuplicateIndex.load(path, THRESHOLD if near_duplicates is True else near_duplicates)
+    seen = set()
+    count = 0
+    try:
+        for p in iter_problems(path):
+            count += 1
+            check_problem(p, taxonomy, report)
+            if index is not None:
+                _check_near_duplicates(p, index, seen, report)
+    except ValidationAborted:
+        pass
+    return count, report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Validate every field of the problems corpus.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('--max-errors', type=int, default=MAX_ERRORS)
+    parser.add_argument('--fail-fast', action='store_true')
+    parser.add_argument('--near-duplicates', type=float, nargs='?', const=True, metavar='SIMILARITY',
+                        help='also flag problems at least this similar to an earlier one (default 0.8)')
+    args = parser.parse_args()
+
+    count, report = validate_corpus(args.path, args.max_errors, args.fail_fast, args.near_duplicates)
+    if report:
+        print(f"Validation failed with {report.total} errors across {count} problems:")
+        for e in report.errors:
+            print(e)
+        if report.total > len(report.errors):
+            print("...")
+        sys.exit(1)
+    print(f"Validation passed! {count} problems match the schema.")
@@ -0,0 +1,207 @@
+import argparse
+import json
+import math
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from complexity import ComplexityError, canonical_schema, growth, parse
+from problem_store import atomic_write, iter_problems
+from reference_solutions import REFERENCES, generate_inputs
+
+# Empirical check of the declared time complexities.
+#
+# Each problem's reference brute and optimal solutions run on inputs whose
+# size doubles from START_SIZE, each (problem, approach) series in its own
+# spawned worker so one solution's heap and caches never skew another's.
+# Every size gets warmup calls, then REPEAT timeit-style batches; the best
+# per-call time is kept. A series stops once the next size, extrapolated
+# from the last two, would take longer than MAX_CALL per call.
+#
+# The log-log slope over the larger half of the sizes is the measured
+# exponent. A declared n^a log^b n predicts a slope of about a + b / ln n;
+# exponential and factorial classes just need a slope above SUPERPOLY.
+
+PROBLEMS_PATH = 'backend/data/problems.json'
+START_SIZE = 4
+MAX_SIZE = 1 << 17
+MAX_CALL = 0.5
+MIN_BATCH = 0.005
+REPEAT = 5
+WARMUP = 1
+TOLERANCE = 0.4
+SUPERPOLY = 2.5
+TASK_TIMEOUT = 300
+APPROACHES = ('brute', 'optimal')
+
+
+def _fresh(args, mutates):
+    return tuple(list(a) if isinstance(a, list) else a for a in args) if mutates else args
+
+
+def time_call(fn, args, mutates=False, repeat=REPEAT, warmup=WARMUP):
+    """Best seconds per call of fn(*args) over `repeat` batches."""
+    for _ in range(warmup):
+        fn(*_fresh(args, mutates))
+    loops = 1
+    best = None
+    runs = 0
+    while runs < repeat:
+        # Inputs a call would mutate are copied before the clock starts
+        batch = [_fresh(args, mutates) for _ in range(loops)]
+        started = time.perf_counter()
+        for a in batch:
+            fn(*a)
+        elapsed = time.perf_counter() - started
+        if elapsed < MIN_BATCH and best is None:
+            loops *= 2
+            continue
+        best = min(best, elapsed / loops) if best is not None else elapsed / loops
+        runs += 1
+    return best
+
+
+def measure(problem, approach, start=START_SIZE, max_size=MAX_SIZE, max_call=MAX_CALL, seed=0):
+    """Time one approach on doubling sizes; returns (sizes, seconds per call)."""
+    reference = REFERENCES[problem['slug']]
+    fn = getattr(reference, approach)
+    sizes, times = [], []
+    n = start
+    while n <= max_size:
+        t = time_call(fn, generate_inputs(problem, n, seed), reference.mutates)
+        sizes.append(n)
+        times.append(t)
+        if t > max_call or (len(times) > 1 and t * t / times[-2] > max_call):
+            break
+        n *= 2
+    return sizes, times
+
+
+def fit_exponent(sizes, times):
+    """Log-log slope over the larger half of the sizes, or None below three points."""
+    if len(sizes) < 3:
+        return None
+    k = max(3, len(sizes) // 2)
+    slope, _ = np.polyfit(np.log(sizes[-k:]), np.log(times[-k:]), 1)
+    return float(slope)
+
+
+def expected_exponent(declared, n):
+    """Slope the declared class predicts around size n; None for super-polynomial classes."""
+    g = growth(parse(declared).expr)
+    if g[0] or g[1]:
+        return None
+    log_n = math.log(n)
+    return float(g[2]) + float(g[3]) / log_n + float(g[4]) / (log_n * math.log(log_n))
+
+
+def judge(declared, sizes, slope):
+    """None when the measurement agrees with `declared`, else the reason it does not."""
+    if slope is None:
+        return None
+    k = max(3, len(sizes) // 2)
+    expected = expected_exponent(declared, math.exp(np.mean(np.log(sizes[-k:]))))
+    if expected is None:
+        return None if slope >= SUPERPOLY else f"declared super-polynomial, measured n^{slope:.2f}"
+    if abs(slope - expected) > TOLERANCE:
+        return f"expected n^{expected:.2f}, measured n^{slope:.2f}"
+    return None
+
+
+def _task(args):
+    problem, approach, options = args
+    return measure(problem, approach, **options)
+
+
+def declared_times(p):
+    schema = canonical_schema(p)
+    return {approach: schema.get(approach, {}).get('time') for approach in APPROACHES}
+
+
+def plan(path, only=None):
+    """Split the corpus into (problem, approach, declared) jobs and problems without a reference."""
+    seen = set()
+    jobs = []
+    skipped = []
+    for p in iter_problems(path):
+        slug = p.get('slug')
+        if slug in seen or (only and slug not in only):
+            continue
+        seen.add(slug)
+        if slug not in REFERENCES:
+            skipped.append(p)
+            continue
+        for approach, declared in declared_times(p).items():
+            jobs.append((p, approach, declared))
+    return jobs, skipped
+
+
+def run(jobs, workers=1, options=None):
+    """Measure each job in its own worker process; yields one result dict per job."""
+    options = options or {}
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(workers, maxtasksperchild=1) as pool:
+        pending = [pool.apply_async(_task, ((p, approach, options),)) for p, approach, _ in jobs]
+        for (p, approach, declared), result in zip(jobs, pending):
+            record = {'id': p['id'], 'slug': p['slug'], 'approach': approach, 'declared': declared}
+            try:
+                sizes, times = result.get(TASK_TIMEOUT)
+            except multiprocessing.TimeoutError:
+                record['error'] = f"timed out after {TASK_TIMEOUT} s"
+                yield record
+                continue
+            except Exception as e:
+                # Raised in the worker (bad input scaling, a crashing solution); the other jobs go on
+                record['error'] = f"{type(e).__name__}: {e}"
+                yield record
+                continue
+            slope = fit_exponent(sizes, times)
+            record.update(sizes=sizes, seconds=times, exponent=slope)
+            if declared is not None:
+                try:
+                    record['mismatch'] = judge(declared, sizes, slope)
+                except ComplexityError as e:
+                    record['error'] = str(e)
+            yield record
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure reference solutions and check the declared time complexities.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('--only', help='comma-separated slugs')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='parallel series; more than 1 trades timing accuracy for speed')
+    parser.add_argument('--max-size', type=int, default=MAX_SIZE)
+    parser.add_argument('--max-call', type=float, default=MAX_CALL, help='seconds per call that ends a series')
+    parser.add_argument('--curves', help='write the measured runtime curves to this JSON file')
+    args = parser.parse_args()
+
+    only = set(args.only.split(',')) if args.only else None
+    options = {'max_size': args.max_size, 'max_call': args.max_call}
+    curves = {}
+    mismatches = 0
+    jobs, skipped = plan(args.path, only)
+    for r in run(jobs, args.workers, options):
+        label = f"{r['id']:>5} {r['slug']:<48} {r['approach']:<8} {r['declared'] or '-':<16}"
+        if 'error' in r:
+            print(f"{label} ERROR {r['error']}")
+            continue
+        slope = f"n^{r['exponent']:.2f}" if r['exponent'] is not None else 'too few sizes'
+        verdict = ''
+        if r.get('mismatch'):
+            mismatches += 1
+            verdict = f"  MISMATCH: {r['mismatch']}"
+        print(f"{label} {slope:<10} up to n={r['sizes'][-1]}{verdict}")
+        curves.setdefault(r['slug'], {})[r['approach']] = {
+            'declared': r['declared'], 'sizes': r['sizes'], 'seconds': r['seconds'], 'exponent': r['exponent']}
+
+    drills = sum(1 for p in skipped if p.get('title', '').startswith('Pattern Drill'))
+    print(f"{len(curves)} problems measured, {mismatches} mismatches; "
+          f"{len(skipped)} have no reference solution ({drills} Pattern Drills)")
+    if args.curves:
+        with atomic_write(args.curves) as f:
+            json.dump(curves, f, indent=2)
+    if mismatches:
+        sys.exit(1)
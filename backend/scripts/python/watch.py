@@ -0,0 +1,118 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+from facet_index import update_facets
+from generate_problems import ENRICH_STAGE
+from pipeline_cache import run_stages
+from problem_store import corpus_files, iter_problems
+from taxonomy import load_taxonomy
+from validate_problems import ErrorBuffer, check_problem
+import standardize_complexity
+import update_problems_v3
+
+# Watch mode for the data pipeline.
+#
+# Polls problems.json (or a shard directory) and backend/*_meta.json.
+# On a corpus change the cached stages re-run as one composed unit, touching
+# only records whose content hash moved, and only those are re-validated.
+# On a meta change the one problem it overrides is re-validated with the
+# meta merged on top, the same way sync_json_to_db.js merges it.
+
+PROBLEMS_PATH = 'backend/data/problems.json'
+META_GLOB = 'backend/*_meta.json'
+STAGES = [ENRICH_STAGE, update_problems_v3.STAGE, standardize_complexity.STAGE]
+
+
+def _mtimes(paths):
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+    return stamps
+
+
+def _validate(records, taxonomy):
+    report = ErrorBuffer()
+    count = 0
+    for p in records:
+        count += 1
+        check_problem(p, taxonomy, report)
+    for e in report.errors:
+        print(f"  {e}")
+    print(f"  validated {count} problems, {report.total} errors")
+
+
+def on_corpus_change(path, taxonomy):
+    result = run_stages(path, STAGES)
+    print(f"  {result}")
+    if result.changed:
+        _validate(iter_problems(path, ids=result.changed), taxonomy)
+        print(f"  facet index: {len(update_facets(path, ids=result.changed))} problems re-indexed")
+
+
+def on_meta_change(path, meta_path, taxonomy):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except ValueError as e:
+        print(f"  could not parse {meta_path}: {e}")
+        return
+    # Meta files hold database rows, so object fields arrive JSON-encoded
+    for key, value in meta.items():
+        if isinstance(value, str) and value[:1] in ('[', '{'):
+            try:
+                meta[key] = json.loads(value)
+            except ValueError:
+                pass
+    base = next(iter_problems(path, ids=[meta.get('id')]), {})
+    _validate([{**base, **meta}], taxonomy)
+
+
+def watch(path, meta_glob, interval):
+    taxonomy = load_taxonomy()
+    corpus = _mtimes(corpus_files(path))
+    metas = _mtimes(glob.glob(meta_glob))
+    print(f"Watching {path} and {meta_glob} (Ctrl+C to stop)")
+
+    while True:
+        time.sleep(interval)
+
+        now = _mtimes(corpus_files(path))
+        if now != corpus:
+            started = time.perf_counter()
+            print(f"{path} changed")
+            on_corpus_change(path, taxonomy)
+            print(f"  done in {(time.perf_counter() - started) * 1000:.0f} ms")
+            # Our own rewrites must not retrigger the stages
+            corpus = _mtimes(corpus_files(path))
+
+        now = _mtimes(glob.glob(meta_glob))
+        for meta_path, stamp in now.items():
+            if metas.get(meta_path) != stamp:
+                started = time.perf_counter()
+                print(f"{meta_path} changed")
+                on_meta_change(path, meta_path, taxonomy)
+                print(f"  done in {(time.perf_counter() - started) * 1000:.0f} ms")
+        metas = now
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-run only the affected pipeline stages when data files change.')
+    parser.add_argument('path', nargs='?', default=PROBLEMS_PATH)
+    parser.add_argument('--meta', default=META_GLOB, help='glob for per-problem *_meta.json overrides')
+    parser.add_argument('--interval', type=float, default=0.5, help='polling interval in seconds')
+    parser.add_argument('--once', action='store_true', help='run the stages once and exit')
+    args = parser.parse_args()
+
+    if args.once:
+        on_corpus_change(args.path, load_taxonomy())
+    else:
+        try:
+            watch(args.path, args.meta, args.interval)
+        except KeyboardInterrupt:
+            pass
@@ -5,8 +5,8 @@ import {
     ArrowLeft,
     AlertTriangle
 } from 'lucide-react'
-import foundationsData from '../../data/foundations.json'
-import { FoundationCategory, FoundationModule as FoundationModuleType } from '../../types/foundation'
+import { foundationChunks } from '../../services/foundationChunks'
+import { FoundationModule as FoundationModuleType } from '../../types/foundation'
 import { FoundationHero } from './FoundationHero'
 import { ProgressionTabs } from './ProgressionTabs'
 import { ProgressionContent } from './ProgressionContent'
@@ -43,19 +43,18 @@ const FoundationModule = () => {
 
     const [progressionLevel, setProgressionLevel] = useState<'fundamentals' | 'patterns' | 'advanced'>('fundamentals')
 
-    // Load module from foundations data
-    const categories = foundationsData as any as FoundationCategory[]
-    let module: FoundationModuleType | undefined
-
-    if (categories && Array.isArray(categories)) {
-        for (const category of categories) {
-            const found = category.modules?.find((m: any) => m.id === resolvedId)
-            if (found) {
-                module = found as FoundationModuleType
-                break
-            }
-        }
-    }
+    // Load only this module's chunk; undefined while loading, null if it does not exist
+    const [module, setModule] = useState<FoundationModuleType | null | undefined>(undefined)
+
+    useEffect(() => {
+        if (!resolvedId) return
+        let cancelled = false
+        setModule(undefined)
+        foundationChunks.module(resolvedId)
+            .then((found) => { if (!cancelled) setModule(found ?? null) })
+            .catch(() => { if (!cancelled) setModule(null) })
+        return () => { cancelled = true }
+    }, [resolvedId])
 
     // Effect for redirect logic 
     useEffect(() => {
@@ -77,6 +76,10 @@ const FoundationModule = () => {
     }, [isCorePattern, activeTab, patternId, navigate])
 
 
+    if (module === undefined && resolvedId) {
+        return <div className="min-h-screen bg-[#2b0d38]" />
+    }
+
     if (!module) {
         return (
             <div className="min-h-screen bg-[#2b0d38] flex items-center justify-center p-6">
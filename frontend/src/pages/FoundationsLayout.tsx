@@ -10,7 +10,7 @@ import {
     ArrowLeft
 } from 'lucide-react'
 import { useStore } from '../store/useStore'
-import foundationsData from '../data/foundations.json'
+import { foundationChunks } from '../services/foundationChunks'
 import { FoundationCategory } from '../types/foundation'
 import CategoryView from '../components/foundations/CategoryView'
 
@@ -26,11 +26,33 @@ const FoundationsLayout = () => {
     const patternStats = useStore(state => state.patternStats)
     const [selectedCategory, setSelectedCategory] = useState<FoundationCategory | null>(null)
 
-    const categories = foundationsData as unknown as FoundationCategory[]
+    // The manifest carries every field the category views read; module bodies load per module
+    const [categories, setCategories] = useState<FoundationCategory[]>([])
+    const [loadState, setLoadState] = useState<'loading' | 'loaded' | 'error'>('loading')
+    const [attempt, setAttempt] = useState(0)
 
-    // Sync state with URL
+    useEffect(() => {
+        let cancelled = false
+        setLoadState('loading')
+        foundationChunks.manifest()
+            .then((manifest) => {
+                if (cancelled) return
+                setCategories(manifest.categories as unknown as FoundationCategory[])
+                setLoadState('loaded')
+            })
+            .catch(() => {
+                if (cancelled) return
+                setCategories([])
+                setLoadState('error')
+            })
+        return () => { cancelled = true }
+    }, [attempt])
+
+    // Sync state with URL; once loading has finished (or failed) an unknown
+    // category falls back to the home view, which shows any load error
     useEffect(() => {
         if (categoryId) {
+            if (loadState === 'loading') return
             const found = categories.find(c => c.id === categoryId)
             if (found) {
                 setSelectedCategory(found)
@@ -41,7 +63,7 @@ const FoundationsLayout = () => {
         } else {
             setSelectedCategory(null)
         }
-    }, [categoryId, categories, navigate])
+    }, [categoryId, categories, loadState, navigate])
 
     const getCategoryStats = (category: FoundationCategory) => {
         const total = category.modules.length
@@ -87,6 +109,18 @@ const FoundationsLayout = () => {
                                 exit={{ opacity: 0, y: -20 }}
                                 className="h-full flex flex-col justify-center"
                             >
+                                {loadState === 'error' && (
+                                    <div className="max-w-md mx-auto text-center p-8 rounded-[32px] border border-white/5 bg-white/[0.02]">
+                                        <h3 className="text-xl font-bold text-white mb-2">Could not load the academy</h3>
+                                        <p className="text-white/40 text-sm font-light mb-6">The course catalogue failed to download. Check your connection and try again.</p>
+                                        <button
+                                            onClick={() => setAttempt(a => a + 1)}
+                                            className="px-6 py-3 rounded-xl bg-white/5 hover:bg-white/10 text-[10px] font-bold uppercase tracking-[0.2em] text-white/60 transition-colors"
+                                        >
+                                            Retry
+                                        </button>
+                                    </div>
+                                )}
                                 <div className="grid grid-cols-1 lg:grid-cols-3 gap-8 h-auto lg:h-[600px] content-center">
                                     {categories.map((cat, idx) => {
                                         const Icon = ICON_MAP[cat.icon] || Layers
@@ -11,7 +11,7 @@ import {
     RotateCcw
 } from 'lucide-react'
 import { useStore } from '../store/useStore'
-import masteryDrills from '../data/mastery_drills.json'
+import { foundationChunks } from '../services/foundationChunks'
 
 interface Drill {
     id: string
@@ -41,12 +41,15 @@ const PatternMastery = () => {
 
     // Load Drills on Mount
     useEffect(() => {
-        if (pattern && masteryDrills[pattern as keyof typeof masteryDrills]) {
+        if (!pattern) return
+        let cancelled = false
+        foundationChunks.drills<Drill>(pattern).then((allDrills) => {
+            if (cancelled || !allDrills.length) return
             // Shuffle and pick 5
-            const allDrills = masteryDrills[pattern as keyof typeof masteryDrills] as Drill[]
             const shuffled = [...allDrills].sort(() => 0.5 - Math.random())
             setDrills(shuffled.slice(0, 5))
-        }
+        }).catch(() => {})
+        return () => { cancelled = true }
     }, [pattern])
 
     // Get current confidence for header
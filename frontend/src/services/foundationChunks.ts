@@ -0,0 +1,84 @@
+import { FoundationModule } from '../types/foundation';
+
+// Loads the per-module chunks written by backend/scripts/python/split_foundations.py.
+// The manifests are small and fetched once; each module view fetches only its own
+// chunk, whose name carries a content hash so the browser may cache it forever.
+
+const DATA_BASE = '/data';
+
+export interface ChunkEntry {
+    id: string;
+    chunk: string;
+    hash: string;
+    size: number;
+    gzipSize?: number;
+    brotliSize?: number;
+}
+
+export interface ModuleEntry extends ChunkEntry {
+    title: string;
+    family?: string;
+    difficulty?: string;
+    description?: string;
+}
+
+export interface CategoryEntry {
+    id: string;
+    title: string;
+    description: string;
+    icon: string;
+    modules: ModuleEntry[];
+}
+
+export interface FoundationsManifest {
+    version: number;
+    categories: CategoryEntry[];
+}
+
+export interface DrillsManifest {
+    version: number;
+    patterns: (ChunkEntry & { count: number })[];
+}
+
+const cache = new Map<string, Promise<any>>();
+
+function fetchJson<T>(path: string): Promise<T> {
+    let pending = cache.get(path);
+    if (!pending) {
+        pending = fetch(`${DATA_BASE}/${path}`).then((response) => {
+            if (!response.ok) {
+                throw new Error(`Failed to load ${path}: ${response.status}`);
+            }
+            return response.json();
+        });
+        // A failed request is retried on the next call
+        pending.catch(() => cache.delete(path));
+        cache.set(path, pending);
+    }
+    return pending;
+}
+
+export const foundationChunks = {
+    manifest(): Promise<FoundationsManifest> {
+        return fetchJson<FoundationsManifest>('foundations.manifest.json');
+    },
+    drillsManifest(): Promise<DrillsManifest> {
+        return fetchJson<DrillsManifest>('mastery_drills.manifest.json');
+    },
+    // The first module with this id in manifest order, as FoundationModule.tsx resolves it
+    async module(id: string): Promise<FoundationModule | undefined> {
+        const manifest = await this.manifest();
+        for (const category of manifest.categories) {
+            const entry = category.modules.find((m) => m.id === id);
+            if (entry) {
+                return fetchJson<FoundationModule>(entry.chunk);
+            }
+        }
+        return undefined;
+    },
+    async drills<T = unknown>(pattern: string): Promise<T[]> {
+        const manifest = await this.drillsManifest();
+        const entry = manifest.patterns.find((p) => p.id === pattern);
+        return entry ? fetchJson<T[]>(entry.chunk) : [];
+    },
+};
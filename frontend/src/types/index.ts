@@ -155,7 +155,7 @@ export interface Problem {
     structuredExamples?: any;
     primaryPattern?: string;
     subPattern?: string;
-    patternLevel?: 'foundation' | 'core_patterns' | 'advanced_patterns';
+    patternLevel?: 'data_structures' | 'core_patterns' | 'advanced_patterns';
     shortPatternReason?: string;
     edgeCases?: string[];
     patternSignals?: string[];